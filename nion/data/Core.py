@@ -1,4 +1,5 @@
 # standard libraries
+import concurrent.futures
 import copy
 import functools
 import math
@@ -10,7 +11,7 @@ import numpy
 import numpy.fft
 import numpy.typing
 import scipy
-import scipy.fftpack
+import scipy.fft
 import scipy.ndimage
 import scipy.ndimage.filters
 import scipy.ndimage.fourier
@@ -45,14 +46,11 @@ def column(data_and_metadata_in: _DataAndMetadataLike, start: int, stop: int) ->
     data_and_metadata = DataAndMetadata.promote_ndarray(data_and_metadata_in)
 
     def calculate_data() -> _ImageDataType:
-        start_0 = start if start is not None else 0
-        stop_0 = stop if stop is not None else data_shape(data_and_metadata)[0]
+        shape = data_shape(data_and_metadata)
         start_1 = start if start is not None else 0
-        stop_1 = stop if stop is not None else data_shape(data_and_metadata)[1]
-        meshgrid = numpy.meshgrid(numpy.linspace(start_1, stop_1, data_shape(data_and_metadata)[1]),
-                                  numpy.linspace(start_0, stop_0, data_shape(data_and_metadata)[0]),
-                                  sparse=True)  # type: ignore
-        return meshgrid[0]  # type: ignore
+        stop_1 = stop if stop is not None else shape[1]
+        # a single row which broadcasts against the full shape; same as the sparse meshgrid column component.
+        return numpy.linspace(start_1, stop_1, shape[1])[numpy.newaxis, :]
 
     return DataAndMetadata.new_data_and_metadata(calculate_data(), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=data_and_metadata.dimensional_calibrations)
 
@@ -61,13 +59,11 @@ def row(data_and_metadata_in: _DataAndMetadataLike, start: int, stop: int) -> Da
     data_and_metadata = DataAndMetadata.promote_ndarray(data_and_metadata_in)
 
     def calculate_data() -> _ImageDataType:
+        shape = data_shape(data_and_metadata)
         start_0 = start if start is not None else 0
-        stop_0 = stop if stop is not None else data_shape(data_and_metadata)[0]
-        start_1 = start if start is not None else 0
-        stop_1 = stop if stop is not None else data_shape(data_and_metadata)[1]
-        meshgrid = numpy.meshgrid(numpy.linspace(start_1, stop_1, data_shape(data_and_metadata)[1]),
-                                  numpy.linspace(start_0, stop_0, data_shape(data_and_metadata)[0]), sparse=True)  # type: ignore
-        return meshgrid[1]  # type: ignore
+        stop_0 = stop if stop is not None else shape[0]
+        # a single column which broadcasts against the full shape; same as the sparse meshgrid row component.
+        return numpy.linspace(start_0, stop_0, shape[0])[:, numpy.newaxis]
 
     return DataAndMetadata.new_data_and_metadata(calculate_data(), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=data_and_metadata.dimensional_calibrations)
 
@@ -76,12 +72,15 @@ def radius(data_and_metadata_in: _DataAndMetadataLike, normalize: bool = True) -
     data_and_metadata = DataAndMetadata.promote_ndarray(data_and_metadata_in)
 
     def calculate_data() -> _ImageDataType:
-        start_0 = -1 if normalize else -data_shape(data_and_metadata)[0] * 0.5
+        shape = data_shape(data_and_metadata)
+        start_0 = -1 if normalize else -shape[0] * 0.5
         stop_0 = -start_0
-        start_1 = -1 if normalize else -data_shape(data_and_metadata)[1] * 0.5
+        start_1 = -1 if normalize else -shape[1] * 0.5
         stop_1 = -start_1
-        icol, irow = numpy.meshgrid(numpy.linspace(start_1, stop_1, data_shape(data_and_metadata)[1]), numpy.linspace(start_0, stop_0, data_shape(data_and_metadata)[0]), sparse=True)  # type: ignore
-        return numpy.sqrt(icol * icol + irow * irow)  # type: ignore
+        icol = numpy.linspace(start_1, stop_1, shape[1])[numpy.newaxis, :]
+        irow = numpy.linspace(start_0, stop_0, shape[0])[:, numpy.newaxis]
+        # hypot broadcasts the row and column into the only full size array
+        return numpy.hypot(icol, irow)
 
     return DataAndMetadata.new_data_and_metadata(calculate_data(), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=data_and_metadata.dimensional_calibrations)
 
@@ -99,11 +98,11 @@ def full(shape: DataAndMetadata.ShapeType, fill_value: typing.Any, dtype: typing
 
 def arange(start: int, stop: typing.Optional[int] = None, step: typing.Optional[int] = None) -> DataAndMetadata.DataAndMetadata:
     if stop is None:
-        start = 0
         stop = start
+        start = 0
     if step is None:
         step = 1
-    return DataAndMetadata.new_data_and_metadata(numpy.linspace(int(start), int(stop), int(step)))
+    return DataAndMetadata.new_data_and_metadata(numpy.arange(int(start), int(stop), int(step)))
 
 
 def linspace(start: float, stop: float, num: int, endpoint: bool = True) -> DataAndMetadata.DataAndMetadata:
@@ -133,7 +132,11 @@ dtype_map: typing.Mapping[typing.Any, str] = {int: "int", float: "float", comple
                                               numpy.float32: "float32", numpy.float64: "float64",
                                               numpy.complex64: "complex64", numpy.complex128: "complex128"}
 
-dtype_inverse_map = {dtype_map[k]: k for k in dtype_map}
+dtype_inverse_map: typing.Mapping[str, numpy.typing.DTypeLike] = {dtype_map[k]: k for k in dtype_map}
+
+# dtype instances do not hash equal to their scalar types (numpy.dtype("int16") vs numpy.int16), so they are looked up
+# in a map keyed by dtype. the builtin types come first in dtype_map, so the sized names win for the same dtype.
+_dtype_instance_map: "typing.Mapping[numpy.dtype[typing.Any], str]" = {numpy.dtype(k): v for k, v in dtype_map.items()}
 
 
 def str_to_dtype(str: str) -> numpy.typing.DTypeLike:
@@ -141,6 +144,8 @@ def str_to_dtype(str: str) -> numpy.typing.DTypeLike:
 
 
 def dtype_to_str(dtype: numpy.typing.DTypeLike) -> str:
+    if isinstance(dtype, numpy.dtype):
+        return _dtype_instance_map.get(dtype, "float")
     return dtype_map.get(dtype, "float")
 
 
@@ -150,33 +155,46 @@ def function_fft(data_and_metadata_in: _DataAndMetadataLike) -> DataAndMetadata.
     data_shape = data_and_metadata.data_shape
     data_dtype = data_and_metadata.data_dtype
 
-    def calculate_data() -> _ImageDataType:
-        data = data_and_metadata.data
-        assert data is not None
+    def calculate_data(data: _ImageDataType) -> _ImageDataType:
         # scaling: numpy.sqrt(numpy.mean(numpy.absolute(data_copy)**2)) == numpy.sqrt(numpy.mean(numpy.absolute(data_copy_fft)**2))
         # see https://gist.github.com/endolith/1257010
         if Image.is_data_1d(data):
             scaling = 1.0 / numpy.sqrt(data_shape[0])
-            return scipy.fftpack.fftshift(numpy.multiply(scipy.fftpack.fft(data), scaling))  # type: ignore
+            data_fft = scipy.fft.fft(numpy.asarray(data), workers=-1)
+            data_fft *= scaling
+            return scipy.fft.fftshift(data_fft)  # type: ignore
         elif Image.is_data_2d(data):
+            # the transform input is only overwritten when it is a temporary made here. otherwise the source data
+            # is transformed directly; scipy.fft does not modify it and no defensive copy is needed. asarray reads data
+            # backed by h5py, which scipy.fft does not accept, and leaves an ndarray as is.
+            data_2d: _ImageDataType
             if Image.is_data_rgb_type(data):
                 if Image.is_data_rgb(data):
-                    data_copy = numpy.sum(data[..., :] * (0.2126, 0.7152, 0.0722), 2)
+                    data_2d = numpy.sum(data[..., :] * (0.2126, 0.7152, 0.0722), 2)
                 else:
-                    data_copy = numpy.sum(data[..., :] * (0.2126, 0.7152, 0.0722, 0.0), 2)
+                    data_2d = numpy.sum(data[..., :] * (0.2126, 0.7152, 0.0722, 0.0), 2)
+                overwrite_x = True
             else:
-                data_copy = numpy.copy(data)  # type: ignore  # let other threads use data while we're processing
+                data_2d = numpy.asarray(data)
+                overwrite_x = False
+            transform_dtype = numpy.promote_types(data_2d.dtype, numpy.float64)
+            if numpy.issubdtype(data_2d.dtype, numpy.inexact) and transform_dtype != data_2d.dtype:
+                # scipy.fft keeps single/half precision, but the 2d transform has always produced double precision.
+                data_2d = data_2d.astype(transform_dtype)
+                overwrite_x = True
             scaling = 1.0 / numpy.sqrt(data_shape[1] * data_shape[0])
-            # note: the numpy.fft.fft2 is faster than scipy.fftpack.fft2, probably either because
-            # our conda distribution compiles numpy for multiprocessing, the numpy version releases
-            # the GIL, or both.
-            return scipy.fftpack.fftshift(numpy.multiply(numpy.fft.fft2(data_copy), scaling))  # type: ignore
+            # note: scipy.fft (pocketfft) releases the GIL and can split the transform across all cores.
+            data_fft = scipy.fft.fft2(data_2d, workers=-1, overwrite_x=overwrite_x)
+            data_fft *= scaling
+            return scipy.fft.fftshift(data_fft)  # type: ignore
         else:
             raise NotImplementedError()
 
     src_dimensional_calibrations = data_and_metadata.dimensional_calibrations
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("FFT: invalid data")
 
     assert len(src_dimensional_calibrations) == len(Image.dimensional_shape_from_shape_and_dtype(data_shape, data_dtype) or ())
@@ -187,7 +205,7 @@ def function_fft(data_and_metadata_in: _DataAndMetadataLike) -> DataAndMetadata.
                                 "1/" + dimensional_calibration.units) for dimensional_calibration, data_shape_n in
         zip(src_dimensional_calibrations, data_shape)]
 
-    return DataAndMetadata.new_data_and_metadata(calculate_data(), dimensional_calibrations=dimensional_calibrations)
+    return DataAndMetadata.new_data_and_metadata(calculate_data(typing.cast(_ImageDataType, data)), dimensional_calibrations=dimensional_calibrations)
 
 
 def function_ifft(data_and_metadata_in: _DataAndMetadataLike) -> DataAndMetadata.DataAndMetadata:
@@ -196,24 +214,25 @@ def function_ifft(data_and_metadata_in: _DataAndMetadataLike) -> DataAndMetadata
     data_shape = data_and_metadata.data_shape
     data_dtype = data_and_metadata.data_dtype
 
-    def calculate_data() -> _ImageDataType:
-        data = data_and_metadata.data
-        assert data is not None
+    def calculate_data(data: _ImageDataType) -> _ImageDataType:
         # scaling: numpy.sqrt(numpy.mean(numpy.absolute(data_copy)**2)) == numpy.sqrt(numpy.mean(numpy.absolute(data_copy_fft)**2))
         # see https://gist.github.com/endolith/1257010
         if Image.is_data_1d(data):
             scaling = numpy.sqrt(data_shape[0])
-            return scipy.fftpack.ifft(scipy.fftpack.ifftshift(data) * scaling)  # type: ignore
+            return scipy.fft.ifft(scipy.fft.ifftshift(data) * scaling, workers=-1, overwrite_x=True)  # type: ignore
         elif Image.is_data_2d(data):
-            data_copy = numpy.copy(data)  # type: ignore  # let other threads use data while we're processing
+            # ifftshift always produces a new array, so no defensive copy of data is needed and the
+            # shifted array can be overwritten by the transform.
             scaling = numpy.sqrt(data_shape[1] * data_shape[0])
-            return scipy.fftpack.ifft2(scipy.fftpack.ifftshift(data_copy) * scaling)  # type: ignore
+            return scipy.fft.ifft2(scipy.fft.ifftshift(data) * scaling, workers=-1, overwrite_x=True)  # type: ignore
         else:
             raise NotImplementedError()
 
     src_dimensional_calibrations = data_and_metadata.dimensional_calibrations
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Inverse FFT: invalid data")
 
     assert len(src_dimensional_calibrations) == len(Image.dimensional_shape_from_shape_and_dtype(data_shape, data_dtype) or ())
@@ -228,34 +247,97 @@ def function_ifft(data_and_metadata_in: _DataAndMetadataLike) -> DataAndMetadata
                                                         remove_one_slash(dimensional_calibration.units)) for
         dimensional_calibration, data_shape_n in zip(src_dimensional_calibrations, data_shape)]
 
-    return DataAndMetadata.new_data_and_metadata(calculate_data(), dimensional_calibrations=dimensional_calibrations)
+    return DataAndMetadata.new_data_and_metadata(calculate_data(typing.cast(_ImageDataType, data)), dimensional_calibrations=dimensional_calibrations)
+
+
+def _normalized_frames(data: _ImageDataType) -> _ImageDataType:
+    # return a new float64 array with each 2d frame (last two axes) scaled to zero mean and unit standard deviation.
+    # frames with zero standard deviation are returned unchanged. works in place on one buffer to avoid temporaries.
+    # complex frames are reduced to the real part, scaled by the deviation of the complex values from its mean.
+    frame_axes = (-2, -1)
+    data_real = data.real if numpy.iscomplexobj(data) else data
+    data_mean = data_real.mean(axis=frame_axes, dtype=numpy.float64, keepdims=True)
+    data_norm = numpy.subtract(data_real, data_mean, dtype=numpy.float64)
+    # einsum sums the squares without allocating them
+    data_sum_sq = numpy.einsum("...ij,...ij->...", data_norm, data_norm)
+    if numpy.iscomplexobj(data):
+        data_sum_sq += numpy.einsum("...ij,...ij->...", data.imag, data.imag, dtype=numpy.float64)
+    data_var = data_sum_sq.reshape(data_mean.shape) / (data.shape[-2] * data.shape[-1])
+    data_std = numpy.sqrt(data_var)
+    zero_std = data_std == 0.0
+    if numpy.any(zero_std):
+        # all values in these frames are equal to the mean; add it back
+        data_norm += numpy.where(zero_std, data_mean, 0.0)
+        data_std[zero_std] = 1.0
+    data_norm /= data_std
+    return data_norm
+
+
+def _autocorrelate_stack(data: _ImageDataType) -> _ImageDataType:
+    # auto-correlate each 2d frame of a stack of frames. the frames are transformed together so that the
+    # fft plan is only built once for the whole stack.
+    # _normalized_frames returns real frames, also for complex data, so the real transform applies.
+    frame_axes = (-2, -1)
+    scaling = 1.0 / (data.shape[-2] * data.shape[-1])
+    data_fft = scipy.fft.rfft2(_normalized_frames(data), axes=frame_axes, workers=-1, overwrite_x=True)
+    # replace the spectrum with its squared magnitude in place, using the real and imaginary parts as buffers.
+    data_fft_real = data_fft.real
+    data_fft_imag = data_fft.imag
+    numpy.square(data_fft_real, out=data_fft_real)
+    numpy.square(data_fft_imag, out=data_fft_imag)
+    data_fft_real += data_fft_imag
+    data_fft_imag.fill(0.0)
+    result = scipy.fft.irfft2(data_fft, s=data.shape[-2:], axes=frame_axes, workers=-1, overwrite_x=True)
+    return typing.cast(_ImageDataType, scipy.fft.fftshift(result, axes=frame_axes) * scaling)
+    # this gives different results. why? because for some reason scipy pads out to 1023 and does calculation.
+    # see https://github.com/scipy/scipy/blob/master/scipy/signal/signaltools.py
+    # return scipy.signal.fftconvolve(data_copy, numpy.conj(data_copy), mode='same')
 
 
 def function_autocorrelate(data_and_metadata_in: _DataAndMetadataLike) -> DataAndMetadata.DataAndMetadata:
     data_and_metadata = DataAndMetadata.promote_ndarray(data_and_metadata_in)
 
-    def calculate_data() -> _ImageDataType:
-        data = data_and_metadata.data
-        assert data is not None
+    def calculate_data(data: _ImageDataType) -> _ImageDataType:
         if Image.is_data_2d(data):
-            data_copy = numpy.copy(data)  # type: ignore  # let other threads use data while we're processing
-            data_std = data_copy.std(dtype=numpy.float64)
-            if data_std != 0.0:
-                data_norm = (data_copy - data_copy.mean(dtype=numpy.float64)) / data_std
-            else:
-                data_norm = data_copy
-            scaling = 1.0 / (data_norm.shape[0] * data_norm.shape[1])
-            data_norm = numpy.fft.rfft2(data_norm)  # type: ignore
-            return numpy.fft.fftshift(numpy.fft.irfft2(data_norm * numpy.conj(data_norm))) * scaling  # type: ignore
-            # this gives different results. why? because for some reason scipy pads out to 1023 and does calculation.
-            # see https://github.com/scipy/scipy/blob/master/scipy/signal/signaltools.py
-            # return scipy.signal.fftconvolve(data_copy, numpy.conj(data_copy), mode='same')
+            # asarray handles data backed by h5py, which does not support newaxis indexing
+            return typing.cast(_ImageDataType, _autocorrelate_stack(numpy.asarray(data)[numpy.newaxis, ...])[0])
         raise NotImplementedError()
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
+        raise ValueError("Auto-correlate: invalid data")
+
+    return DataAndMetadata.new_data_and_metadata(calculate_data(typing.cast(_ImageDataType, data)), dimensional_calibrations=data_and_metadata.dimensional_calibrations)
+
+
+def function_autocorrelate_batch(data_and_metadata_like_list: typing.Sequence[_DataAndMetadataLike]) -> typing.Sequence[DataAndMetadata.DataAndMetadata]:
+    """Auto-correlate multiple 2d data_and_metadatas of the same shape.
+
+    Equivalent to calling autocorrelate on each item, but the ffts are done on all items at once.
+    """
+    data_and_metadata_list = [DataAndMetadata.promote_ndarray(data_and_metadata) for data_and_metadata in data_and_metadata_like_list]
+
+    if not data_and_metadata_list:
+        raise ValueError("Auto-correlate: must have at least one item.")
+
+    data_list = [data_and_metadata.data for data_and_metadata in data_and_metadata_list]
+
+    if any(not Image.is_data_valid(data) for data in data_list):
         raise ValueError("Auto-correlate: invalid data")
 
-    return DataAndMetadata.new_data_and_metadata(calculate_data(), dimensional_calibrations=data_and_metadata.dimensional_calibrations)
+    if any(not Image.is_data_2d(data) for data in data_list):
+        raise NotImplementedError()
+
+    partial_shape = data_and_metadata_list[0].data_shape
+
+    if any([data_and_metadata.data_shape != partial_shape for data_and_metadata in data_and_metadata_list]):
+        raise ValueError("Auto-correlate: all data must have same shape.")
+
+    result_data = _autocorrelate_stack(numpy.stack(typing.cast(typing.List[_ImageDataType], data_list)))
+
+    return [DataAndMetadata.new_data_and_metadata(data, dimensional_calibrations=data_and_metadata.dimensional_calibrations)
+            for data, data_and_metadata in zip(result_data, data_and_metadata_list)]
 
 
 def function_crosscorrelate(*args: _DataAndMetadataIndeterminateSizeLike) -> DataAndMetadata.DataAndMetadata:
@@ -275,34 +357,35 @@ def function_crosscorrelate(*args: _DataAndMetadataIndeterminateSizeLike) -> Dat
     data_and_metadata1 = DataAndMetadata.promote_constant(data_and_metadata_or_constant1, shape)
     data_and_metadata2 = DataAndMetadata.promote_constant(data_and_metadata_or_constant2, shape)
 
-    def calculate_data() -> _ImageDataType:
-        data1 = data_and_metadata1._data_ex
-        data2 = data_and_metadata2._data_ex
+    def calculate_data(data1: _ImageDataType, data2: _ImageDataType) -> _ImageDataType:
         if Image.is_data_2d(data1) and Image.is_data_2d(data2):
-            data_std1 = data1.std(dtype=numpy.float64)
-            if data_std1 != 0.0:
-                norm1 = (data1 - data1.mean(dtype=numpy.float64)) / data_std1
-            else:
-                norm1 = data1
-            data_std2 = data2.std(dtype=numpy.float64)
-            if data_std2 != 0.0:
-                norm2 = (data2 - data2.mean(dtype=numpy.float64)) / data_std2
-            else:
-                norm2 = data2
+            norm1 = _normalized_frames(data1)
+            norm2 = _normalized_frames(data2)
             scaling = 1.0 / (norm1.shape[0] * norm1.shape[1])
-            return numpy.fft.fftshift(numpy.fft.irfft2(numpy.fft.rfft2(norm1) * numpy.conj(numpy.fft.rfft2(norm2)))) * scaling  # type: ignore
+            # the normalized frames are temporaries, so the transforms may reuse them; the product and the conjugate
+            # are then formed in place in the spectra.
+            data1_fft = scipy.fft.rfft2(norm1, workers=-1, overwrite_x=True)
+            data2_fft = scipy.fft.rfft2(norm2, workers=-1, overwrite_x=True)
+            numpy.conjugate(data2_fft, out=data2_fft)
+            data1_fft *= data2_fft
+            result = scipy.fft.fftshift(scipy.fft.irfft2(data1_fft, s=norm1.shape, workers=-1, overwrite_x=True))
+            result *= scaling
+            return typing.cast(_ImageDataType, result)
             # this gives different results. why? because for some reason scipy pads out to 1023 and does calculation.
             # see https://github.com/scipy/scipy/blob/master/scipy/signal/signaltools.py
             # return scipy.signal.fftconvolve(data1.copy(), numpy.conj(data2.copy()), mode='same')
         raise NotImplementedError()
 
-    if not Image.is_data_valid(data_and_metadata1.data):
+    data1 = data_and_metadata1.data
+    data2 = data_and_metadata2.data
+
+    if not Image.is_data_valid(data1):
         raise ValueError("Cross correlate: invalid data 1")
 
-    if not Image.is_data_valid(data_and_metadata2.data):
+    if not Image.is_data_valid(data2):
         raise ValueError("Cross correlate: invalid data 2")
 
-    return DataAndMetadata.new_data_and_metadata(calculate_data(), dimensional_calibrations=data_and_metadata1.dimensional_calibrations)
+    return DataAndMetadata.new_data_and_metadata(calculate_data(typing.cast(_ImageDataType, data1), typing.cast(_ImageDataType, data2)), dimensional_calibrations=data_and_metadata1.dimensional_calibrations)
 
 
 def function_register(data1_in: _DataAndMetadataLike, data2_in: _DataAndMetadataLike, subtract_means: bool,
@@ -408,18 +491,20 @@ def function_register_template(image_xdata_in: _DataAndMetadataLike, template_xd
 
 def function_shift(src_in: _DataAndMetadataLike, shift: typing.Tuple[float, ...], *, order: int = 1) -> DataAndMetadata.DataAndMetadata:
     src = DataAndMetadata.promote_ndarray(src_in)
-    if not Image.is_data_valid(src.data):
+    src_data = src.data
+    if not Image.is_data_valid(src_data):
         raise ValueError("Shift: invalid data")
-    src_data = src._data_ex
+    assert src_data is not None
     shifted = scipy.ndimage.shift(src_data, shift, order=order, cval=numpy.mean(src_data))
     return DataAndMetadata.new_data_and_metadata(numpy.squeeze(shifted))
 
 
 def function_fourier_shift(src_in: _DataAndMetadataLike, shift: typing.Tuple[float, ...]) -> DataAndMetadata.DataAndMetadata:
     src = DataAndMetadata.promote_ndarray(src_in)
-    if not Image.is_data_valid(src.data):
+    data = src.data
+    if not Image.is_data_valid(data):
         raise ValueError("Shift: invalid data")
-    src_data = numpy.fft.fftn(src._data_ex)  # type: ignore
+    src_data = numpy.fft.fftn(data)  # type: ignore
     do_squeeze = False
     if len(src_data.shape) == 1:
         src_data = src_data[..., numpy.newaxis]
@@ -606,7 +691,8 @@ def function_sequence_insert(src1_in: _DataAndMetadataLike, src2_in: _DataAndMet
         raise ValueError("Sequence insert: both sources must have same datum shape.")
     c = src1.sequence_dimension_shape[0]
     channel = max(0, min(c, int(position)))
-    result: numpy.typing.NDArray[typing.Any] = numpy.vstack([src1._data_ex[:channel], src2._data_ex, src1._data_ex[channel:]])
+    src1_data = src1._data_ex
+    result: numpy.typing.NDArray[typing.Any] = numpy.vstack([src1_data[:channel], src2._data_ex, src1_data[channel:]])
     intensity_calibration = src1.intensity_calibration
     dimensional_calibrations = src1.dimensional_calibrations
     data_descriptor = src1.data_descriptor
@@ -709,122 +795,148 @@ def function_fourier_mask(data_and_metadata_in: _DataAndMetadataIndeterminateSiz
     data_and_metadata = DataAndMetadata.promote_constant(data_and_metadata_c, shape)
     mask_data_and_metadata = DataAndMetadata.promote_constant(mask_data_and_metadata_c, shape)
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+    mask_data = mask_data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Fourier mask: invalid data")
 
-    if not Image.is_data_valid(mask_data_and_metadata.data):
+    if not Image.is_data_valid(mask_data):
         raise ValueError("Fourier mask: invalid mask data")
 
-    if not Image.is_data_2d(data_and_metadata.data):
+    if not Image.is_data_2d(data):
         raise ValueError("Fourier mask: data must be 2D")
 
-    if not Image.is_data_2d(mask_data_and_metadata.data):
+    if not Image.is_data_2d(mask_data):
         raise ValueError("Fourier mask: data must be 2D")
 
-    data = data_and_metadata._data_ex
-    mask_data = mask_data_and_metadata._data_ex
+    assert data is not None and mask_data is not None
 
+    # the mask is made symmetric about the center (zero frequency). rows above the center use the values of the mask
+    # mirrored through the center; row 0, column 0, the center row, and the center column use the mask as is. rather
+    # than building the symmetric mask, multiply each region by its (possibly reversed) view of the mask directly into
+    # the result, so that each element is written once.
     y_half = data.shape[0] // 2
-    y_half_p1 = y_half + 1
-    y_half_m1 = y_half - 1
-    y_low = 0 if data.shape[0] % 2 == 0 else None
     x_half = data.shape[1] // 2
-    x_half_p1 = x_half + 1
-    x_half_m1 = x_half - 1
     x_low = 0 if data.shape[1] % 2 == 0 else None
-    fourier_mask_data = numpy.empty_like(mask_data)
-    fourier_mask_data[y_half_p1:, x_half_p1:] = mask_data[y_half_p1:, x_half_p1:]
-    fourier_mask_data[y_half_p1:, x_half_m1:x_low:-1] = mask_data[y_half_p1:, x_half_m1:x_low:-1]
-    fourier_mask_data[y_half_m1:y_low:-1, x_half_m1:x_low:-1] = mask_data[y_half_p1:, x_half_p1:]
-    fourier_mask_data[y_half_m1:y_low:-1, x_half_p1:] = mask_data[y_half_p1:, x_half_m1:x_low:-1]
-    fourier_mask_data[0, :] = mask_data[0, :]
-    fourier_mask_data[:, 0] = mask_data[:, 0]
-    fourier_mask_data[y_half, :] = mask_data[y_half, :]
-    fourier_mask_data[:, x_half] = mask_data[:, x_half]
-    masked_data: _ImageDataType = data * fourier_mask_data
+    upper = slice(1, y_half)
+    upper_mirrored = slice(2 * y_half - 1, y_half, -1)
+    masked_data: _ImageDataType = numpy.empty(data.shape, numpy.result_type(data.dtype, mask_data.dtype))
+    numpy.multiply(data[y_half:], mask_data[y_half:], out=masked_data[y_half:])
+    numpy.multiply(data[:1], mask_data[:1], out=masked_data[:1])
+    numpy.multiply(data[upper, 0], mask_data[upper, 0], out=masked_data[upper, 0])
+    numpy.multiply(data[upper, x_half], mask_data[upper, x_half], out=masked_data[upper, x_half])
+    numpy.multiply(data[upper, 1:x_half], mask_data[upper_mirrored, 2 * x_half - 1:x_half:-1], out=masked_data[upper, 1:x_half])
+    numpy.multiply(data[upper, x_half + 1:], mask_data[upper_mirrored, x_half - 1:x_low:-1], out=masked_data[upper, x_half + 1:])
 
     return DataAndMetadata.new_data_and_metadata(masked_data, intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=data_and_metadata.dimensional_calibrations)
 
 
+def _filter_rgb_type(data: _ImageDataType, channels_fn: typing.Callable[..., typing.Any]) -> _ImageDataType:
+    # filter the color channels of rgb or rgba data with a single call to channels_fn, which must not filter
+    # along the channel axis. alpha is passed through unchanged.
+    rgb_type_data: numpy.typing.NDArray[numpy.uint8] = numpy.empty(data.shape, numpy.uint8)
+    channels_fn(data[..., :3], output=rgb_type_data[..., :3])
+    if data.shape[-1] == 4:
+        rgb_type_data[..., 3] = data[..., 3]
+    return rgb_type_data
+
+
+def _sobel_channels(channels: _ImageDataType, output: _ImageDataType) -> None:
+    # same as scipy.ndimage.sobel on each channel: differentiate along the last spatial axis, smooth along the others.
+    # the filter runs in float32 and is saturated to the uint8 range in the same pass that writes the output.
+    filtered = scipy.ndimage.correlate1d(channels, [-1, 0, 1], axis=channels.ndim - 2, output=numpy.float32)
+    for axis in range(channels.ndim - 2):
+        scipy.ndimage.correlate1d(filtered, [1, 2, 1], axis=axis, output=filtered)
+    numpy.clip(filtered, 0, 255, out=output, casting="unsafe")
+
+
+def _laplace_channels(channels: _ImageDataType, output: _ImageDataType) -> None:
+    # same as scipy.ndimage.laplace on each channel: sum of second derivatives along the spatial axes.
+    # the filter runs in float32 and is saturated to the uint8 range in the same pass that writes the output.
+    filtered = scipy.ndimage.correlate1d(channels, [1, -2, 1], axis=0, output=numpy.float32)
+    for axis in range(1, channels.ndim - 1):
+        filtered += scipy.ndimage.correlate1d(channels, [1, -2, 1], axis=axis, output=numpy.float32)
+    numpy.clip(filtered, 0, 255, out=output, casting="unsafe")
+
+
 def function_sobel(data_and_metadata_in: _DataAndMetadataLike) -> DataAndMetadata.DataAndMetadata:
     data_and_metadata = DataAndMetadata.promote_ndarray(data_and_metadata_in)
 
-    def calculate_data() -> _ImageDataType:
-        data = data_and_metadata.data
-        assert data is not None
-        if Image.is_shape_and_dtype_rgb(data.shape, data.dtype):
-            rgb: numpy.typing.NDArray[numpy.uint8] = numpy.empty(data.shape[:-1] + (3,), numpy.uint8)
-            rgb[..., 0] = scipy.ndimage.sobel(data[..., 0])
-            rgb[..., 1] = scipy.ndimage.sobel(data[..., 1])
-            rgb[..., 2] = scipy.ndimage.sobel(data[..., 2])
-            return rgb
-        elif Image.is_shape_and_dtype_rgba(data.shape, data.dtype):
-            rgba: numpy.typing.NDArray[numpy.uint8] = numpy.empty(data.shape[:-1] + (4,), numpy.uint8)
-            rgba[..., 0] = scipy.ndimage.sobel(data[..., 0])
-            rgba[..., 1] = scipy.ndimage.sobel(data[..., 1])
-            rgba[..., 2] = scipy.ndimage.sobel(data[..., 2])
-            rgba[..., 3] = data[..., 3]
-            return rgba
+    def calculate_data(data: _ImageDataType) -> _ImageDataType:
+        if Image.is_shape_and_dtype_rgb_type(data.shape, data.dtype):
+            return _filter_rgb_type(data, _sobel_channels)
         else:
             return scipy.ndimage.sobel(data)  # type: ignore
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Sobel: invalid data")
 
-    return DataAndMetadata.new_data_and_metadata(calculate_data(), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=data_and_metadata.dimensional_calibrations)
+    return DataAndMetadata.new_data_and_metadata(calculate_data(typing.cast(_ImageDataType, data)), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=data_and_metadata.dimensional_calibrations)
 
 
 def function_laplace(data_and_metadata_in: _DataAndMetadataLike) -> DataAndMetadata.DataAndMetadata:
     data_and_metadata = DataAndMetadata.promote_ndarray(data_and_metadata_in)
 
-    def calculate_data() -> _ImageDataType:
-        data = data_and_metadata.data
-        assert data is not None
-        if Image.is_shape_and_dtype_rgb(data.shape, data.dtype):
-            rgb: numpy.typing.NDArray[numpy.uint8] = numpy.empty(data.shape[:-1] + (3,), numpy.uint8)
-            rgb[..., 0] = scipy.ndimage.laplace(data[..., 0])
-            rgb[..., 1] = scipy.ndimage.laplace(data[..., 1])
-            rgb[..., 2] = scipy.ndimage.laplace(data[..., 2])
-            return rgb
-        elif Image.is_shape_and_dtype_rgba(data.shape, data.dtype):
-            rgba: numpy.typing.NDArray[numpy.uint8] = numpy.empty(data.shape[:-1] + (4,), numpy.uint8)
-            rgba[..., 0] = scipy.ndimage.laplace(data[..., 0])
-            rgba[..., 1] = scipy.ndimage.laplace(data[..., 1])
-            rgba[..., 2] = scipy.ndimage.laplace(data[..., 2])
-            rgba[..., 3] = data[..., 3]
-            return rgba
+    def calculate_data(data: _ImageDataType) -> _ImageDataType:
+        if Image.is_shape_and_dtype_rgb_type(data.shape, data.dtype):
+            return _filter_rgb_type(data, _laplace_channels)
         else:
             return scipy.ndimage.laplace(data)  # type: ignore
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Laplace: invalid data")
 
-    return DataAndMetadata.new_data_and_metadata(calculate_data(), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=data_and_metadata.dimensional_calibrations)
+    return DataAndMetadata.new_data_and_metadata(calculate_data(typing.cast(_ImageDataType, data)), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=data_and_metadata.dimensional_calibrations)
+
+
+_gaussian_blur_strip_bytes = 1 << 20
+
+
+def _gaussian_blur(data: _ImageDataType, output: _ImageDataType, sigma: float, spatial_ndim: int) -> None:
+    # same as scipy.ndimage.gaussian_filter over the first spatial_ndim axes. large 2d images are blurred in strips of
+    # rows, each extended by the kernel radius for the vertical pass, so that a strip stays in cache between the two
+    # passes. the strips are independent and ndimage releases the gil, so they are filtered on a thread pool.
+    radius = int(4.0 * sigma + 0.5)  # gaussian_filter1d default truncate
+    height = data.shape[0] if data.ndim > 0 else 0
+    row_bytes = max(math.prod(data.shape[1:]) * data.dtype.itemsize, 1)
+    strip_height = max(4 * radius, _gaussian_blur_strip_bytes // row_bytes)
+    if spatial_ndim != 2 or radius == 0 or height <= strip_height:
+        scipy.ndimage.gaussian_filter(data, sigma=(sigma,) * spatial_ndim + (0,) * (data.ndim - spatial_ndim), output=output)
+        return
+
+    data = numpy.asarray(data)
+
+    def blur_strip(top: int) -> None:
+        bottom = min(top + strip_height, height)
+        halo_top = max(top - radius, 0)
+        halo_bottom = min(bottom + radius, height)
+        strip = scipy.ndimage.gaussian_filter1d(data[halo_top:halo_bottom], sigma, axis=0)
+        scipy.ndimage.gaussian_filter1d(strip[top - halo_top:bottom - halo_top], sigma, axis=1, output=output[top:bottom])
+
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        list(executor.map(blur_strip, range(0, height, strip_height)))
 
 
 def function_gaussian_blur(data_and_metadata_in: _DataAndMetadataLike, sigma: float) -> DataAndMetadata.DataAndMetadata:
     data_and_metadata = DataAndMetadata.promote_ndarray(data_and_metadata_in)
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Gaussian blur: invalid data")
 
+    assert data is not None
     new_data: _ImageDataType
-    data = data_and_metadata._data_ex
-    if Image.is_shape_and_dtype_rgb(data.shape, data.dtype):
-        rgb: numpy.typing.NDArray[numpy.uint8] = numpy.empty(data.shape[:-1] + (3,), numpy.uint8)
-        rgb[..., 0] = scipy.ndimage.gaussian_filter(data[..., 0], sigma=sigma)
-        rgb[..., 1] = scipy.ndimage.gaussian_filter(data[..., 1], sigma=sigma)
-        rgb[..., 2] = scipy.ndimage.gaussian_filter(data[..., 2], sigma=sigma)
-        new_data = rgb
-    elif Image.is_shape_and_dtype_rgba(data.shape, data.dtype):
-        rgba: numpy.typing.NDArray[numpy.uint8] = numpy.empty(data.shape[:-1] + (4,), numpy.uint8)
-        rgba[..., 0] = scipy.ndimage.gaussian_filter(data[..., 0], sigma=sigma)
-        rgba[..., 1] = scipy.ndimage.gaussian_filter(data[..., 1], sigma=sigma)
-        rgba[..., 2] = scipy.ndimage.gaussian_filter(data[..., 2], sigma=sigma)
-        rgba[..., 3] = data[..., 3]
-        new_data = rgba
+    if Image.is_shape_and_dtype_rgb_type(data.shape, data.dtype):
+        new_data = _filter_rgb_type(data, functools.partial(_gaussian_blur, sigma=sigma, spatial_ndim=data.ndim - 1))
     else:
-        new_data = scipy.ndimage.gaussian_filter(data, sigma=sigma)  # type: ignore
+        new_data = numpy.empty(data.shape, data.dtype)
+        _gaussian_blur(data, new_data, sigma, data.ndim)
 
     return DataAndMetadata.new_data_and_metadata(new_data, intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=data_and_metadata.dimensional_calibrations)
 
@@ -834,29 +946,19 @@ def function_median_filter(data_and_metadata_in: _DataAndMetadataLike, size: int
 
     size = max(min(int(size), 999), 1)
 
-    def calculate_data() -> _ImageDataType:
-        data = data_and_metadata.data
-        assert data is not None
-        if Image.is_shape_and_dtype_rgb(data.shape, data.dtype):
-            rgb: numpy.typing.NDArray[numpy.uint8] = numpy.empty(data.shape[:-1] + (3,), numpy.uint8)
-            rgb[..., 0] = scipy.ndimage.median_filter(data[..., 0], size=size)
-            rgb[..., 1] = scipy.ndimage.median_filter(data[..., 1], size=size)
-            rgb[..., 2] = scipy.ndimage.median_filter(data[..., 2], size=size)
-            return rgb
-        elif Image.is_shape_and_dtype_rgba(data.shape, data.dtype):
-            rgba: numpy.typing.NDArray[numpy.uint8] = numpy.empty(data.shape[:-1] + (4,), numpy.uint8)
-            rgba[..., 0] = scipy.ndimage.median_filter(data[..., 0], size=size)
-            rgba[..., 1] = scipy.ndimage.median_filter(data[..., 1], size=size)
-            rgba[..., 2] = scipy.ndimage.median_filter(data[..., 2], size=size)
-            rgba[..., 3] = data[..., 3]
-            return rgba
+    def calculate_data(data: _ImageDataType) -> _ImageDataType:
+        if Image.is_shape_and_dtype_rgb_type(data.shape, data.dtype):
+            channel_size = (size,) * (data.ndim - 1) + (1,)
+            return _filter_rgb_type(data, functools.partial(scipy.ndimage.median_filter, size=channel_size))
         else:
             return scipy.ndimage.median_filter(data, size=size)  # type: ignore
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Median filter: invalid data")
 
-    return DataAndMetadata.new_data_and_metadata(calculate_data(), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=data_and_metadata.dimensional_calibrations)
+    return DataAndMetadata.new_data_and_metadata(calculate_data(typing.cast(_ImageDataType, data)), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=data_and_metadata.dimensional_calibrations)
 
 
 def function_uniform_filter(data_and_metadata_in: _DataAndMetadataLike, size: int) -> DataAndMetadata.DataAndMetadata:
@@ -864,36 +966,25 @@ def function_uniform_filter(data_and_metadata_in: _DataAndMetadataLike, size: in
 
     size = max(min(int(size), 999), 1)
 
-    def calculate_data() -> _ImageDataType:
-        data = data_and_metadata.data
-        assert data is not None
-        if Image.is_shape_and_dtype_rgb(data.shape, data.dtype):
-            rgb: numpy.typing.NDArray[numpy.uint8] = numpy.empty(data.shape[:-1] + (3,), numpy.uint8)
-            rgb[..., 0] = scipy.ndimage.uniform_filter(data[..., 0], size=size)
-            rgb[..., 1] = scipy.ndimage.uniform_filter(data[..., 1], size=size)
-            rgb[..., 2] = scipy.ndimage.uniform_filter(data[..., 2], size=size)
-            return rgb
-        elif Image.is_shape_and_dtype_rgba(data.shape, data.dtype):
-            rgba: numpy.typing.NDArray[numpy.uint8] = numpy.empty(data.shape[:-1] + (4,), numpy.uint8)
-            rgba[..., 0] = scipy.ndimage.uniform_filter(data[..., 0], size=size)
-            rgba[..., 1] = scipy.ndimage.uniform_filter(data[..., 1], size=size)
-            rgba[..., 2] = scipy.ndimage.uniform_filter(data[..., 2], size=size)
-            rgba[..., 3] = data[..., 3]
-            return rgba
+    def calculate_data(data: _ImageDataType) -> _ImageDataType:
+        if Image.is_shape_and_dtype_rgb_type(data.shape, data.dtype):
+            channel_size = (size,) * (data.ndim - 1) + (1,)
+            return _filter_rgb_type(data, functools.partial(scipy.ndimage.uniform_filter, size=channel_size))
         else:
             return scipy.ndimage.uniform_filter(data, size=size)  # type: ignore
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Uniform filter: invalid data")
 
-    return DataAndMetadata.new_data_and_metadata(calculate_data(), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=data_and_metadata.dimensional_calibrations)
+    return DataAndMetadata.new_data_and_metadata(calculate_data(typing.cast(_ImageDataType, data)), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=data_and_metadata.dimensional_calibrations)
 
 
 def function_transpose_flip(data_and_metadata_in: _DataAndMetadataLike, transpose: bool = False, flip_v: bool = False, flip_h: bool = False) -> DataAndMetadata.DataAndMetadata:
     data_and_metadata = DataAndMetadata.promote_ndarray(data_and_metadata_in)
 
-    def calculate_data() -> _ImageDataType:
-        data = data_and_metadata._data_ex
+    def calculate_data(data: _ImageDataType) -> _ImageDataType:
         data_id = id(data)
         if transpose:
             if Image.is_shape_and_dtype_rgb_type(data.shape, data.dtype):
@@ -910,7 +1001,9 @@ def function_transpose_flip(data_and_metadata_in: _DataAndMetadataLike, transpos
         else:
             return data
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Transpose flip: invalid data")
 
     if transpose:
@@ -918,31 +1011,33 @@ def function_transpose_flip(data_and_metadata_in: _DataAndMetadataLike, transpos
     else:
         dimensional_calibrations = list(data_and_metadata.dimensional_calibrations)
 
-    return DataAndMetadata.new_data_and_metadata(calculate_data(), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=dimensional_calibrations)
+    return DataAndMetadata.new_data_and_metadata(calculate_data(typing.cast(_ImageDataType, data)), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=dimensional_calibrations)
 
 
 def function_invert(data_and_metadata_in: _DataAndMetadataLike) -> DataAndMetadata.DataAndMetadata:
     data_and_metadata = DataAndMetadata.promote_ndarray(data_and_metadata_in)
 
-    def calculate_data() -> _ImageDataType:
-        data = data_and_metadata.data
-        assert data is not None
+    def calculate_data(data: _ImageDataType) -> _ImageDataType:
         if Image.is_shape_and_dtype_rgb_type(data.shape, data.dtype):
             if Image.is_data_rgba(data):
-                inverted = 255 - data[:]
+                # invert only the color channels; alpha is copied once rather than inverted and then overwritten.
+                inverted: numpy.typing.NDArray[numpy.uint8] = numpy.empty(data.shape, numpy.uint8)
+                numpy.subtract(255, data[..., :3], out=inverted[..., :3])
                 inverted[..., 3] = data[..., 3]
-                return typing.cast(_ImageDataType, inverted)
+                return inverted
             else:
-                return typing.cast(_ImageDataType, 255 - data[:])
+                return typing.cast(_ImageDataType, numpy.subtract(255, data[:]))
         else:
-            return typing.cast(_ImageDataType, -data[:])
+            return typing.cast(_ImageDataType, numpy.negative(data[:]))
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Invert: invalid data")
 
     dimensional_calibrations = data_and_metadata.dimensional_calibrations
 
-    return DataAndMetadata.new_data_and_metadata(calculate_data(), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=dimensional_calibrations)
+    return DataAndMetadata.new_data_and_metadata(calculate_data(typing.cast(_ImageDataType, data)), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=dimensional_calibrations)
 
 
 def function_crop(data_and_metadata_in: _DataAndMetadataLike, bounds: NormRectangleType) -> DataAndMetadata.DataAndMetadata:
@@ -1076,15 +1171,16 @@ def function_crop_interval(data_and_metadata_in: _DataAndMetadataLike, interval:
 
     data_shape = data_and_metadata.data_shape
 
-    def calculate_data() -> _ImageDataType:
-        data = data_and_metadata._data_ex
+    def calculate_data(data: _ImageDataType) -> _ImageDataType:
         data_shape = data_and_metadata.data_shape
         interval_int = int(data_shape[0] * interval[0]), int(data_shape[0] * interval[1])
         return typing.cast(_ImageDataType, data[interval_int[0]:interval_int[1]].copy())
 
     dimensional_calibrations = data_and_metadata.dimensional_calibrations
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Crop interval: invalid data")
 
     interval_int = int(data_shape[0] * interval[0]), int(data_shape[0] * interval[1])
@@ -1096,7 +1192,7 @@ def function_crop_interval(data_and_metadata_in: _DataAndMetadataLike, interval:
         dimensional_calibration.scale, dimensional_calibration.units)
     cropped_dimensional_calibrations.append(cropped_calibration)
 
-    return DataAndMetadata.new_data_and_metadata(calculate_data(), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=cropped_dimensional_calibrations)
+    return DataAndMetadata.new_data_and_metadata(calculate_data(typing.cast(_ImageDataType, data)), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=cropped_dimensional_calibrations)
 
 
 def function_slice_sum(data_and_metadata_in: _DataAndMetadataLike, slice_center: int, slice_width: int) -> DataAndMetadata.DataAndMetadata:
@@ -1104,33 +1200,41 @@ def function_slice_sum(data_and_metadata_in: _DataAndMetadataLike, slice_center:
 
     signal_index = -1
 
-    def calculate_data() -> _ImageDataType:
-        data = data_and_metadata._data_ex
+    def calculate_data(data: _ImageDataType) -> _ImageDataType:
         shape = data.shape
         slice_start = int(slice_center - slice_width * 0.5 + 0.5)
         slice_start = max(slice_start, 0)
         slice_end = slice_start + slice_width
         slice_end = min(shape[signal_index], slice_end)
-        return typing.cast(_ImageDataType, numpy.sum(data[..., slice_start:slice_end], signal_index))
+        slice_data = data[..., slice_start:slice_end]
+        accumulate_dtype = numpy.promote_types(slice_data.dtype, numpy.float64)
+        if numpy.issubdtype(slice_data.dtype, numpy.inexact) and accumulate_dtype != slice_data.dtype:
+            # for single/half precision, einsum with a double accumulator avoids the per-row overhead of numpy.sum
+            # over a narrow trailing window and is more accurate than summing in the data's own precision.
+            return typing.cast(_ImageDataType, numpy.einsum("...i->...", slice_data, dtype=accumulate_dtype).astype(slice_data.dtype))
+        return typing.cast(_ImageDataType, numpy.sum(slice_data, signal_index))
 
     dimensional_calibrations = data_and_metadata.dimensional_calibrations
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Slice sum: invalid data")
 
     dimensional_calibrations = dimensional_calibrations[0:signal_index]
 
-    return DataAndMetadata.new_data_and_metadata(calculate_data(), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=dimensional_calibrations)
+    return DataAndMetadata.new_data_and_metadata(calculate_data(typing.cast(_ImageDataType, data)), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=dimensional_calibrations)
 
 
 def function_pick(data_and_metadata_in: _DataAndMetadataLike, position: PickPositionType) -> DataAndMetadata.DataAndMetadata:
     data_and_metadata = DataAndMetadata.promote_ndarray(data_and_metadata_in)
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Pick: invalid data")
 
-    def calculate_data() -> _ImageDataType:
-        data = data_and_metadata._data_ex
+    def calculate_data(data: _ImageDataType) -> _ImageDataType:
         collection_dimensions = data_and_metadata.dimensional_shape[data_and_metadata.collection_dimension_slice]
         datum_dimensions = data_and_metadata.dimensional_shape[data_and_metadata.datum_dimension_slice]
         position_i: typing.List[typing.Union[slice, int, ellipsis]] = list()
@@ -1155,12 +1259,74 @@ def function_pick(data_and_metadata_in: _DataAndMetadataLike, position: PickPosi
     else:
         dimensional_calibrations = list(dimensional_calibrations[data_and_metadata.datum_dimension_slice])
 
-    return DataAndMetadata.new_data_and_metadata(calculate_data(),
+    return DataAndMetadata.new_data_and_metadata(calculate_data(typing.cast(_ImageDataType, data)),
                                                  intensity_calibration=data_and_metadata.intensity_calibration,
                                                  dimensional_calibrations=dimensional_calibrations,
                                                  data_descriptor=data_descriptor)
 
 
+_concatenate_threaded_bytes = 1 << 24
+
+
+def _concatenate(data_list: typing.Sequence[_ImageDataType], axis: int) -> _ImageDataType:
+    # same as numpy.concatenate. large results are preallocated and each item is copied into its own slab; the slabs
+    # are disjoint, so they are filled on a thread pool. numpy releases the gil while copying.
+    shape = data_list[0].shape
+    ndim = len(shape)
+    if len(data_list) < 2 or sum(data.size for data in data_list) * data_list[0].dtype.itemsize < _concatenate_threaded_bytes or not -ndim <= axis < ndim:
+        return numpy.concatenate(data_list, axis)  # type: ignore
+    axis %= ndim
+    if any(len(data.shape) != ndim or data.shape[:axis] != shape[:axis] or data.shape[axis + 1:] != shape[axis + 1:] for data in data_list):
+        return numpy.concatenate(data_list, axis)  # type: ignore
+    axis_lengths = [data.shape[axis] for data in data_list]
+    result: _ImageDataType = numpy.empty(shape[:axis] + (sum(axis_lengths),) + shape[axis + 1:], numpy.result_type(*[data.dtype for data in data_list]))
+    slabs = list()
+    offset = 0
+    for data, axis_length in zip(data_list, axis_lengths):
+        slabs.append((result[(slice(None),) * axis + (slice(offset, offset + axis_length),)], data))
+        offset += axis_length
+
+    def copy_slab(slab: typing.Tuple[_ImageDataType, _ImageDataType]) -> None:
+        slab[0][...] = slab[1]
+
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        list(executor.map(copy_slab, slabs))
+    return result
+
+
+def _stack(data_list: typing.Sequence[_ImageDataType]) -> _ImageDataType:
+    # same as numpy.stack along a new first axis. numpy.stack adds the axis without an intermediate array per item;
+    # large results go through the threaded copy in _concatenate.
+    if sum(data.size for data in data_list) * data_list[0].dtype.itemsize < _concatenate_threaded_bytes:
+        return numpy.stack(data_list)
+    return _concatenate([numpy.expand_dims(data, 0) for data in data_list], 0)
+
+
+def _concatenate_data_and_metadata(data_and_metadata_list: typing.Sequence[DataAndMetadata.DataAndMetadata], data_list: typing.Sequence[_ImageDataType], axis: int) -> DataAndMetadata.DataAndMetadata:
+    # concatenate validated data, already read from data_and_metadata_list into data_list, and merge the metadata.
+    partial_shape = data_and_metadata_list[0].data_shape
+    data_shapes = [data_and_metadata.data_shape for data_and_metadata in data_and_metadata_list]
+
+    # all data must have the same shape except along the concatenation axis. an out of range axis is reported by numpy.
+    if any(len(data_shape) != len(partial_shape) for data_shape in data_shapes):
+        raise ValueError("Concatenate: all data must have same shape.")
+    if -len(partial_shape) <= axis < len(partial_shape):
+        axis_index = axis % len(partial_shape)
+        if any(data_shape[:axis_index] + data_shape[axis_index + 1:] != partial_shape[:axis_index] + partial_shape[axis_index + 1:] for data_shape in data_shapes):
+            raise ValueError("Concatenate: all data must have same shape.")
+
+    # keep each calibration shared by all of the data, otherwise use a default calibration.
+    dimensional_calibrations = [calibrations[0] if all(calibration == calibrations[0] for calibration in calibrations[1:]) else Calibration.Calibration()
+                                for calibrations in zip(*(data_and_metadata.dimensional_calibrations for data_and_metadata in data_and_metadata_list))]
+
+    intensity_calibration = data_and_metadata_list[0].intensity_calibration
+    data_descriptor = data_and_metadata_list[0].data_descriptor
+
+    data = _concatenate(data_list, axis)
+
+    return DataAndMetadata.new_data_and_metadata(data, intensity_calibration=intensity_calibration, dimensional_calibrations=dimensional_calibrations, data_descriptor=data_descriptor)
+
+
 def function_concatenate(data_and_metadata_like_list: typing.Sequence[_DataAndMetadataLike], axis: int = 0) -> DataAndMetadata.DataAndMetadata:
     """Concatenate multiple data_and_metadatas.
 
@@ -1179,29 +1345,13 @@ def function_concatenate(data_and_metadata_like_list: typing.Sequence[_DataAndMe
     if not data_and_metadata_list:
         raise ValueError("Concatenate: must have at least one item to join.")
 
-    if any([not Image.is_data_valid(data_and_metadata.data) for data_and_metadata in data_and_metadata_list]):
-        raise ValueError("Concatenate: invalid data")
-
-    partial_shape = data_and_metadata_list[0].data_shape
-
-    if any([data_and_metadata.data_shape != partial_shape[1:] is None for data_and_metadata in data_and_metadata_list]):
-        raise ValueError("Concatenate: all data must have same shape.")
-
-    dimensional_calibrations: typing.List[Calibration.Calibration] = [typing.cast(Calibration.Calibration, None)] * len(data_and_metadata_list[0].dimensional_calibrations)
-    for data_and_metadata in data_and_metadata_list:
-        for index, calibration in enumerate(data_and_metadata.dimensional_calibrations):
-            if dimensional_calibrations[index] is None:
-                dimensional_calibrations[index] = calibration
-            elif dimensional_calibrations[index] != calibration:
-                dimensional_calibrations[index] = Calibration.Calibration()
+    # read the data once; for data that is loaded on demand, each access to data would load it again.
+    data_list = [data_and_metadata.data for data_and_metadata in data_and_metadata_list]
 
-    intensity_calibration = data_and_metadata_list[0].intensity_calibration
-    data_descriptor = data_and_metadata_list[0].data_descriptor
+    if any(not Image.is_data_valid(data) for data in data_list):
+        raise ValueError("Concatenate: invalid data")
 
-    data_list = list(data_and_metadata.data for data_and_metadata in data_and_metadata_list)
-    data = numpy.concatenate(data_list, axis)  # type: ignore
-
-    return DataAndMetadata.new_data_and_metadata(data, intensity_calibration=intensity_calibration, dimensional_calibrations=dimensional_calibrations, data_descriptor=data_descriptor)
+    return _concatenate_data_and_metadata(data_and_metadata_list, typing.cast(typing.List[_ImageDataType], data_list), axis)
 
 
 def function_hstack(data_and_metadata_like_list: typing.Sequence[_DataAndMetadataLike]) -> DataAndMetadata.DataAndMetadata:
@@ -1221,15 +1371,17 @@ def function_hstack(data_and_metadata_like_list: typing.Sequence[_DataAndMetadat
     if not data_and_metadata_list:
         raise ValueError("H Stack: must have at least one item to join.")
 
-    if any([not Image.is_data_valid(data_and_metadata.data) for data_and_metadata in data_and_metadata_list]):
+    data_list = [data_and_metadata.data for data_and_metadata in data_and_metadata_list]
+
+    if any(not Image.is_data_valid(data) for data in data_list):
         raise ValueError("H Stack: invalid data")
 
     partial_shape = data_and_metadata_list[0].data_shape
 
     if len(partial_shape) >= 2:
-        return function_concatenate(data_and_metadata_list, 1)
+        return _concatenate_data_and_metadata(data_and_metadata_list, typing.cast(typing.List[_ImageDataType], data_list), 1)
     else:
-        return function_concatenate(data_and_metadata_list, 0)
+        return _concatenate_data_and_metadata(data_and_metadata_list, typing.cast(typing.List[_ImageDataType], data_list), 0)
 
 
 def function_vstack(data_and_metadata_like_list: typing.Sequence[_DataAndMetadataLike]) -> DataAndMetadata.DataAndMetadata:
@@ -1249,26 +1401,31 @@ def function_vstack(data_and_metadata_like_list: typing.Sequence[_DataAndMetadat
     if not data_and_metadata_list:
         raise ValueError("V Stack: must have at least one item to join.")
 
-    if any([not Image.is_data_valid(data_and_metadata.data) for data_and_metadata in data_and_metadata_list]):
+    data_list = [data_and_metadata.data for data_and_metadata in data_and_metadata_list]
+
+    if any(not Image.is_data_valid(data) for data in data_list):
         raise ValueError("V Stack: invalid data")
 
     partial_shape = data_and_metadata_list[0].data_shape
 
     if len(partial_shape) >= 2:
-        return function_concatenate(data_and_metadata_list, 0)
+        return _concatenate_data_and_metadata(data_and_metadata_list, typing.cast(typing.List[_ImageDataType], data_list), 0)
 
-    dimensional_calibrations = list()
-    dimensional_calibrations.append(Calibration.Calibration())
-    dimensional_calibrations.append(data_and_metadata_list[0].dimensional_calibrations[0])
+    dimensional_calibrations = [Calibration.Calibration(), data_and_metadata_list[0].dimensional_calibrations[0]]
 
     intensity_calibration = data_and_metadata_list[0].intensity_calibration
 
-    data_descriptor = data_and_metadata_list[0].data_descriptor
+    # the stacked rows become a collection of the 1-D data.
+    src_data_descriptor = data_and_metadata_list[0].data_descriptor
+    data_descriptor = DataAndMetadata.DataDescriptor(src_data_descriptor.is_sequence, src_data_descriptor.collection_dimension_count + 1, src_data_descriptor.datum_dimension_count)
 
-    data_descriptor = DataAndMetadata.DataDescriptor(data_descriptor.is_sequence, data_descriptor.collection_dimension_count + 1, data_descriptor.datum_dimension_count)
+    row_data_list = typing.cast(typing.List[_ImageDataType], data_list)
 
-    data_list = list(data_and_metadata.data for data_and_metadata in data_and_metadata_list)
-    data: numpy.typing.NDArray[typing.Any] = numpy.vstack(typing.cast(typing.Sequence[DataAndMetadata.DataAndMetadata], data_list))
+    # rows of one shape are stacked directly; mixed shapes keep the numpy.vstack semantics.
+    if all(data.shape == partial_shape for data in row_data_list):
+        data = _stack(row_data_list)
+    else:
+        data = numpy.vstack(row_data_list)
 
     return DataAndMetadata.new_data_and_metadata(data, intensity_calibration=intensity_calibration, dimensional_calibrations=dimensional_calibrations, data_descriptor=data_descriptor)
 
@@ -1285,52 +1442,48 @@ def function_moveaxis(data_and_metadata_in: _DataAndMetadataLike, src_axis: int,
     return DataAndMetadata.new_data_and_metadata(data, intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=dimensional_calibrations)
 
 
+def _average_rgb_type(data: _ImageDataType, axis: typing.Optional[typing.Union[int, typing.Sequence[int]]]) -> _ImageDataType:
+    # average the channels of rgb or rgba data over the given spatial axes in a single reduction. the channel axis is
+    # never reduced; negative axes count from the last spatial axis.
+    spatial_ndim = data.ndim - 1
+    axes = tuple(int(a) + spatial_ndim if a < 0 else int(a) for a in numpy.atleast_1d(typing.cast(typing.Any, axis)))
+    return typing.cast(_ImageDataType, numpy.mean(data, axes).astype(numpy.uint8))
+
+
 def function_sum(data_and_metadata_in: _DataAndMetadataLike, axis: typing.Optional[typing.Union[int, typing.Sequence[int]]] = None, keepdims: bool = False) -> DataAndMetadata.DataAndMetadata:
     data_and_metadata = DataAndMetadata.promote_ndarray(data_and_metadata_in)
 
     data_shape = data_and_metadata.data_shape
     data_dtype = data_and_metadata.data_dtype
 
-    def calculate_data() -> _ImageDataType:
-        data = data_and_metadata.data
-        assert data is not None
+    def calculate_data(data: _ImageDataType) -> _ImageDataType:
         if Image.is_shape_and_dtype_rgb_type(data.shape, data.dtype):
-            if Image.is_shape_and_dtype_rgb(data.shape, data.dtype):
-                rgb_image: numpy.typing.NDArray[numpy.uint8] = numpy.empty(data.shape[1:], numpy.uint8)
-                rgb_image[:, 0] = numpy.average(data[..., 0], axis)  # type: ignore
-                rgb_image[:, 1] = numpy.average(data[..., 1], axis)  # type: ignore
-                rgb_image[:, 2] = numpy.average(data[..., 2], axis)  # type: ignore
-                return rgb_image
-            else:
-                rgba_image: numpy.typing.NDArray[numpy.uint8] = numpy.empty(data.shape[1:], numpy.uint8)
-                rgba_image[:, 0] = numpy.average(data[..., 0], axis)  # type: ignore
-                rgba_image[:, 1] = numpy.average(data[..., 1], axis)  # type: ignore
-                rgba_image[:, 2] = numpy.average(data[..., 2], axis)  # type: ignore
-                rgba_image[:, 3] = numpy.average(data[..., 3], axis)  # type: ignore
-                return rgba_image
-        else:
-            return typing.cast(_ImageDataType, numpy.sum(data, typing.cast(typing.Any, axis), keepdims=keepdims))
+            return _average_rgb_type(data, axis)
+        accumulate_dtype = numpy.promote_types(data.dtype, numpy.float64)
+        if numpy.issubdtype(data.dtype, numpy.inexact) and accumulate_dtype != data.dtype:
+            # accumulate single/half precision in double precision; summing along an outer axis adds row by row, so
+            # the rounding error would otherwise grow with the number of rows.
+            return typing.cast(_ImageDataType, numpy.sum(data, typing.cast(typing.Any, axis), dtype=accumulate_dtype, keepdims=keepdims).astype(data.dtype))
+        return typing.cast(_ImageDataType, numpy.sum(data, typing.cast(typing.Any, axis), keepdims=keepdims))
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Sum: invalid data")
 
     dimensional_calibrations = data_and_metadata.dimensional_calibrations
 
-    new_dimensional_calibrations = list()
+    new_dimensional_calibrations: typing.List[Calibration.Calibration] = list()
 
     if not keepdims or Image.is_shape_and_dtype_rgb_type(data_shape, data_dtype):
         assert axis is not None
-        axes: numpy.typing.NDArray[typing.Any] = numpy.atleast_1d(axis)
-        for i in range(len(axes)):
-            if axes[i] < 0:
-                axes[i] += len(dimensional_calibrations)
-        for i in range(len(dimensional_calibrations)):
-            if i not in axes:
-                new_dimensional_calibrations.append(dimensional_calibrations[i])
+        ndim = len(dimensional_calibrations)
+        axes = {int(a) + ndim if a < 0 else int(a) for a in numpy.atleast_1d(axis)}
+        new_dimensional_calibrations = [c for i, c in enumerate(dimensional_calibrations) if i not in axes]
 
     dimensional_calibrations = new_dimensional_calibrations
 
-    return DataAndMetadata.new_data_and_metadata(calculate_data(), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=dimensional_calibrations)
+    return DataAndMetadata.new_data_and_metadata(calculate_data(typing.cast(_ImageDataType, data)), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=dimensional_calibrations)
 
 
 def function_mean(data_and_metadata_in: _DataAndMetadataLike, axis: typing.Optional[typing.Union[int, typing.Sequence[int]]] = None, keepdims: bool = False) -> DataAndMetadata.DataAndMetadata:
@@ -1339,56 +1492,43 @@ def function_mean(data_and_metadata_in: _DataAndMetadataLike, axis: typing.Optio
     data_shape = data_and_metadata.data_shape
     data_dtype = data_and_metadata.data_dtype
 
-    def calculate_data() -> _ImageDataType:
-        data = data_and_metadata.data
-        assert data is not None
+    def calculate_data(data: _ImageDataType) -> _ImageDataType:
         if Image.is_shape_and_dtype_rgb_type(data.shape, data.dtype):
-            if Image.is_shape_and_dtype_rgb(data.shape, data.dtype):
-                rgb_image: numpy.typing.NDArray[numpy.uint8] = numpy.empty(data.shape[1:], numpy.uint8)
-                rgb_image[:, 0] = numpy.average(data[..., 0], axis)  # type: ignore
-                rgb_image[:, 1] = numpy.average(data[..., 1], axis)  # type: ignore
-                rgb_image[:, 2] = numpy.average(data[..., 2], axis)  # type: ignore
-                return rgb_image
-            else:
-                rgba_image: numpy.typing.NDArray[numpy.uint8] = numpy.empty(data.shape[1:], numpy.uint8)
-                rgba_image[:, 0] = numpy.average(data[..., 0], axis)  # type: ignore
-                rgba_image[:, 1] = numpy.average(data[..., 1], axis)  # type: ignore
-                rgba_image[:, 2] = numpy.average(data[..., 2], axis)  # type: ignore
-                rgba_image[:, 3] = numpy.average(data[..., 3], axis)  # type: ignore
-                return rgba_image
+            return _average_rgb_type(data, axis)
         else:
             return typing.cast(_ImageDataType, numpy.mean(data, axis, keepdims=keepdims))
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Mean: invalid data")
 
     dimensional_calibrations = data_and_metadata.dimensional_calibrations
 
-    new_dimensional_calibrations = list()
+    new_dimensional_calibrations: typing.List[Calibration.Calibration] = list()
 
     if not keepdims or Image.is_shape_and_dtype_rgb_type(data_shape, data_dtype):
         assert axis is not None
-        axes: numpy.typing.NDArray[typing.Any] = numpy.atleast_1d(axis)
-        for i in range(len(axes)):
-            if axes[i] < 0:
-                axes[i] += len(dimensional_calibrations)
-        for i in range(len(dimensional_calibrations)):
-            if i not in axes:
-                new_dimensional_calibrations.append(dimensional_calibrations[i])
+        ndim = len(dimensional_calibrations)
+        axes = {int(a) + ndim if a < 0 else int(a) for a in numpy.atleast_1d(axis)}
+        new_dimensional_calibrations = [c for i, c in enumerate(dimensional_calibrations) if i not in axes]
 
     dimensional_calibrations = new_dimensional_calibrations
 
-    return DataAndMetadata.new_data_and_metadata(calculate_data(), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=dimensional_calibrations)
+    return DataAndMetadata.new_data_and_metadata(calculate_data(typing.cast(_ImageDataType, data)), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=dimensional_calibrations)
 
 
 def function_sum_region(data_and_metadata_in: _DataAndMetadataLike, mask_data_and_metadata_in: _DataAndMetadataLike) -> DataAndMetadata.DataAndMetadata:
     data_and_metadata = DataAndMetadata.promote_ndarray(data_and_metadata_in)
     mask_data_and_metadata = DataAndMetadata.promote_ndarray(mask_data_and_metadata_in)
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+    mask_data = mask_data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Sum region: invalid data")
 
-    if not Image.is_data_valid(mask_data_and_metadata.data):
+    if not Image.is_data_valid(mask_data):
         raise ValueError("Sum region: invalid mask data")
 
     if data_and_metadata.is_sequence:
@@ -1397,8 +1537,8 @@ def function_sum_region(data_and_metadata_in: _DataAndMetadataLike, mask_data_an
         assert len(data_and_metadata.dimensional_shape) == 3
     assert len(mask_data_and_metadata.dimensional_shape) == 2
 
-    data = data_and_metadata._data_ex
-    mask_data = mask_data_and_metadata._data_ex.astype(bool)  # type: ignore
+    assert data is not None and mask_data is not None
+    mask_data = mask_data.astype(bool)
 
     start_index = 1 if data_and_metadata.is_sequence else 0
     result_data = numpy.sum(data, axis=tuple(range(start_index, len(data_and_metadata.dimensional_shape) - 1)), where=mask_data[..., numpy.newaxis])
@@ -1419,10 +1559,13 @@ def function_average_region(data_and_metadata_in: _DataAndMetadataLike, mask_dat
     data_and_metadata = DataAndMetadata.promote_ndarray(data_and_metadata_in)
     mask_data_and_metadata = DataAndMetadata.promote_ndarray(mask_data_and_metadata_in)
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+    mask_data = mask_data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Sum region: invalid data")
 
-    if not Image.is_data_valid(mask_data_and_metadata.data):
+    if not Image.is_data_valid(mask_data):
         raise ValueError("Sum region: invalid mask data")
 
     if data_and_metadata.is_sequence:
@@ -1431,10 +1574,8 @@ def function_average_region(data_and_metadata_in: _DataAndMetadataLike, mask_dat
         assert len(data_and_metadata.dimensional_shape) == 3
     assert len(mask_data_and_metadata.dimensional_shape) == 2
 
-    data = data_and_metadata._data_ex
-    mask_data = mask_data_and_metadata._data_ex.astype(bool)  # type: ignore
-
-    assert data is not None
+    assert data is not None and mask_data is not None
+    mask_data = mask_data.astype(bool)
 
     mask_sum = max(1.0, typing.cast(float, numpy.sum(mask_data)))
 
@@ -1469,53 +1610,40 @@ def function_reshape(data_and_metadata_in: _DataAndMetadataLike, shape: DataAndM
 
     data_shape = data_and_metadata.data_shape
 
-    def calculate_data() -> _ImageDataType:
-        data = data_and_metadata.data
-        assert data is not None
+    def calculate_data(data: _ImageDataType) -> _ImageDataType:
         return numpy.reshape(data, shape)
 
     dimensional_calibrations = data_and_metadata.dimensional_calibrations
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Reshape: invalid data")
 
-    total_old_pixels = 1
-    for dimension in data_shape:
-        total_old_pixels *= dimension
-    total_new_pixels = 1
-    for dimension in shape:
-        total_new_pixels *= dimension if dimension > 0 else 1
-    new_dimensional_calibrations = list()
     if len(data_shape) + 1 == len(shape) and -1 in shape:
         # special case going to one more dimension
-        index = 0
-        for dimension in shape:
-            if dimension == -1:
-                new_dimensional_calibrations.append(Calibration.Calibration())
-            else:
-                new_dimensional_calibrations.append(dimensional_calibrations[index])
-                index += 1
+        dimensional_calibration_iter = iter(dimensional_calibrations)
+        new_dimensional_calibrations = [Calibration.Calibration() if dimension == -1 else next(dimensional_calibration_iter) for dimension in shape]
     elif len(data_shape) - 1 == len(shape) and 1 in data_shape:
         # special case going to one fewer dimension
-        for dimension, dimensional_calibration in zip(data_shape, dimensional_calibrations):
-            if dimension == 1:
-                continue
-            else:
-                new_dimensional_calibrations.append(dimensional_calibration)
+        new_dimensional_calibrations = [dimensional_calibration for dimension, dimensional_calibration in zip(data_shape, dimensional_calibrations) if dimension != 1]
     else:
-        for _ in range(len(shape)):
-            new_dimensional_calibrations.append(Calibration.Calibration())
+        new_dimensional_calibrations = [Calibration.Calibration() for _ in shape]
 
-    return DataAndMetadata.new_data_and_metadata(calculate_data(), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=new_dimensional_calibrations)
+    return DataAndMetadata.new_data_and_metadata(calculate_data(typing.cast(_ImageDataType, data)), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=new_dimensional_calibrations)
 
 
 def function_squeeze(data_and_metadata_in: _DataAndMetadataLike) -> DataAndMetadata.DataAndMetadata:
     """Remove dimensions with lengths of one."""
     data_and_metadata = DataAndMetadata.promote_ndarray(data_and_metadata_in)
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Squeeze: invalid data")
 
+    assert data is not None
+
     data_shape = data_and_metadata.data_shape
 
     dimensional_calibrations = data_and_metadata.dimensional_calibrations
@@ -1551,7 +1679,7 @@ def function_squeeze(data_and_metadata_in: _DataAndMetadataLike) -> DataAndMetad
 
     data_descriptor = DataAndMetadata.DataDescriptor(is_sequence, collection_dimension_count, datum_dimension_count)
 
-    data = numpy.squeeze(data_and_metadata._data_ex, axis=tuple(indexes))
+    data = numpy.squeeze(data, axis=tuple(indexes))
 
     return DataAndMetadata.new_data_and_metadata(data, intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=new_dimensional_calibrations, data_descriptor=data_descriptor)
 
@@ -1562,10 +1690,14 @@ def function_redimension(data_and_metadata_in: _DataAndMetadataLike, data_descri
     if data_and_metadata.data_descriptor.expected_dimension_count != data_descriptor.expected_dimension_count:
         raise ValueError("Redimension: overall data array rank must be unchanged")
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Redimension: invalid data")
 
-    return DataAndMetadata.new_data_and_metadata(data_and_metadata._data_ex, intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=data_and_metadata.dimensional_calibrations, data_descriptor=data_descriptor)
+    assert data is not None
+
+    return DataAndMetadata.new_data_and_metadata(data, intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=data_and_metadata.dimensional_calibrations, data_descriptor=data_descriptor)
 
 
 def function_resize(data_and_metadata_in: _DataAndMetadataLike, shape: DataAndMetadata.ShapeType, mode: typing.Optional[str] = None) -> DataAndMetadata.DataAndMetadata:
@@ -1578,13 +1710,14 @@ def function_resize(data_and_metadata_in: _DataAndMetadataLike, shape: DataAndMe
     """
     data_and_metadata = DataAndMetadata.promote_ndarray(data_and_metadata_in)
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Resize: invalid data")
 
     data_shape = data_and_metadata.data_shape
 
-    def calculate_data() -> _ImageDataType:
-        data = data_and_metadata._data_ex
+    def calculate_data(data: _ImageDataType) -> _ImageDataType:
         c = numpy.mean(data)
         data_shape = data_and_metadata.data_shape
         slices = list()
@@ -1615,7 +1748,7 @@ def function_resize(data_and_metadata_in: _DataAndMetadataLike, shape: DataAndMe
             dimensional_calibration.scale, dimensional_calibration.units)
         resized_dimensional_calibrations.append(cropped_calibration)
 
-    return DataAndMetadata.new_data_and_metadata(calculate_data(), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=resized_dimensional_calibrations)
+    return DataAndMetadata.new_data_and_metadata(calculate_data(typing.cast(_ImageDataType, data)), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=resized_dimensional_calibrations)
 
 
 def function_rescale(data_and_metadata_in: _DataAndMetadataLike,
@@ -1627,39 +1760,48 @@ def function_rescale(data_and_metadata_in: _DataAndMetadataLike,
     """
     data_and_metadata = DataAndMetadata.promote_ndarray(data_and_metadata_in)
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Rescale: invalid data")
 
     used_data_range = data_range if data_range is not None else (0.0, 1.0)
 
-    def calculate_data() -> _ImageDataType:
-        data = data_and_metadata.data
-        assert data is not None
-        data_ptp = numpy.ptp(data) if in_range is None else in_range[1] - in_range[0]
-        data_ptp_i = 1.0 / data_ptp if data_ptp != 0.0 else 1.0
+    def calculate_data(data: _ImageDataType) -> _ImageDataType:
         if in_range is not None:
             data_min = in_range[0]
+            data_ptp = in_range[1] - in_range[0]
         else:
+            # numpy.ptp followed by numpy.amin would scan the data for its minimum twice.
             data_min = numpy.amin(data)
+            data_ptp = numpy.amax(data) - data_min
+        data_ptp_i = 1.0 / data_ptp if data_ptp != 0.0 else 1.0
         data_span = used_data_range[1] - used_data_range[0]
-        if data_span == 1.0 and used_data_range[0] == 0.0:
-            return typing.cast(_ImageDataType, (data - data_min) * data_ptp_i)
+        m = data_ptp_i if data_span == 1.0 and used_data_range[0] == 0.0 else data_span * data_ptp_i
+        # scale the difference in place unless it is still integer, in which case scaling promotes it to float.
+        rescaled = data - data_min
+        if numpy.issubdtype(rescaled.dtype, numpy.inexact):
+            rescaled *= m
         else:
-            m = data_span * data_ptp_i
-            return typing.cast(_ImageDataType, (data - data_min) * m + used_data_range[0])
+            rescaled = rescaled * m
+        if data_span != 1.0 or used_data_range[0] != 0.0:
+            rescaled += used_data_range[0]
+        return typing.cast(_ImageDataType, rescaled)
 
     intensity_calibration = Calibration.Calibration()
 
-    return DataAndMetadata.new_data_and_metadata(calculate_data(), intensity_calibration=intensity_calibration, dimensional_calibrations=data_and_metadata.dimensional_calibrations)
+    return DataAndMetadata.new_data_and_metadata(calculate_data(typing.cast(_ImageDataType, data)), intensity_calibration=intensity_calibration, dimensional_calibrations=data_and_metadata.dimensional_calibrations)
 
 
 def function_rebin_2d(data_and_metadata_in: _DataAndMetadataLike, shape: DataAndMetadata.ShapeType) -> DataAndMetadata.DataAndMetadata:
     data_and_metadata = DataAndMetadata.promote_ndarray(data_and_metadata_in)
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Rebin 2D: invalid data")
 
-    if not Image.is_data_2d(data_and_metadata.data):
+    if not Image.is_data_2d(data):
         raise ValueError("Re-bin by 2: data must be 2D")
 
     height = int(shape[0])
@@ -1672,9 +1814,7 @@ def function_rebin_2d(data_and_metadata_in: _DataAndMetadataLike, shape: DataAnd
     height = min(height, data_shape[0])
     width = min(width, data_shape[1])
 
-    def calculate_data() -> _ImageDataType:
-        data = data_and_metadata.data
-        assert data is not None
+    def calculate_data(data: _ImageDataType) -> _ImageDataType:
         if data.shape[0] == height and data.shape[1] == width:
             return numpy.copy(data)  # type: ignore
         shape = height, data.shape[0] // height, width, data.shape[1] // width
@@ -1683,13 +1823,15 @@ def function_rebin_2d(data_and_metadata_in: _DataAndMetadataLike, shape: DataAnd
     dimensions = height, width
     rebinned_dimensional_calibrations = [Calibration.Calibration(dimensional_calibrations[i].offset, dimensional_calibrations[i].scale * data_shape[i] / dimensions[i], dimensional_calibrations[i].units) for i in range(len(dimensional_calibrations))]
 
-    return DataAndMetadata.new_data_and_metadata(calculate_data(), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=rebinned_dimensional_calibrations)
+    return DataAndMetadata.new_data_and_metadata(calculate_data(typing.cast(_ImageDataType, data)), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=rebinned_dimensional_calibrations)
 
 
 def function_resample_2d(data_and_metadata_in: _DataAndMetadataLike, shape: DataAndMetadata.ShapeType) -> DataAndMetadata.DataAndMetadata:
     data_and_metadata = DataAndMetadata.promote_ndarray(data_and_metadata_in)
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Resample: invalid data")
 
     height = int(shape[0])
@@ -1697,9 +1839,7 @@ def function_resample_2d(data_and_metadata_in: _DataAndMetadataLike, shape: Data
 
     data_shape = data_and_metadata.data_shape
 
-    def calculate_data() -> _ImageDataType:
-        data = data_and_metadata.data
-        assert data is not None
+    def calculate_data(data: _ImageDataType) -> _ImageDataType:
         if data.shape[0] == height and data.shape[1] == width:
             return numpy.copy(data)  # type: ignore
         return Image.scaled(data, (height, width))
@@ -1709,7 +1849,7 @@ def function_resample_2d(data_and_metadata_in: _DataAndMetadataLike, shape: Data
     dimensions = height, width
     resampled_dimensional_calibrations = [Calibration.Calibration(dimensional_calibrations[i].offset, dimensional_calibrations[i].scale * data_shape[i] / dimensions[i], dimensional_calibrations[i].units) for i in range(len(dimensional_calibrations))]
 
-    return DataAndMetadata.new_data_and_metadata(calculate_data(), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=resampled_dimensional_calibrations)
+    return DataAndMetadata.new_data_and_metadata(calculate_data(typing.cast(_ImageDataType, data)), intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=resampled_dimensional_calibrations)
 
 
 def function_warp(data_and_metadata_in: _DataAndMetadataLike, coordinates_in: typing.Sequence[_DataAndMetadataLike], order: int = 1) -> DataAndMetadata.DataAndMetadata:
@@ -1776,10 +1916,24 @@ def function_affine_transform(data_and_metadata_in: _DataAndMetadataLike, transf
 def function_histogram(data_and_metadata_in: _DataAndMetadataLike, bins: int) -> DataAndMetadata.DataAndMetadata:
     data_and_metadata = DataAndMetadata.promote_ndarray(data_and_metadata_in)
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Resample: invalid data")
 
-    histogram_data = numpy.histogram(data_and_metadata._data_ex, bins=bins)  # type: ignore
+    data = numpy.asarray(data)
+    histogram_data: typing.Tuple[numpy.typing.NDArray[typing.Any], numpy.typing.NDArray[typing.Any]]
+    data_min = numpy.amin(data) if numpy.issubdtype(data.dtype, numpy.integer) and data.dtype.itemsize <= 4 and data.size > 0 else None
+    data_max = numpy.amax(data) if data_min is not None else None
+    if data_min is not None and data_max is not None and int(data_max) - int(data_min) < data.size:
+        # count each distinct value in a single pass, then bin the values weighted by their counts. numpy assigns the
+        # values to the same bins as it would the data, but does the floating point binning once per value rather
+        # than once per element.
+        value_counts = numpy.bincount(numpy.subtract(data, data_min, dtype=numpy.intp).ravel())
+        values = numpy.arange(int(data_min), int(data_min) + value_counts.shape[0])
+        histogram_data = numpy.histogram(values, bins=bins, range=(data_min, data_max), weights=value_counts)
+    else:
+        histogram_data = numpy.histogram(data, bins=bins)
     min_x = data_and_metadata.intensity_calibration.convert_to_calibrated_value(histogram_data[1][0])
     max_x = data_and_metadata.intensity_calibration.convert_to_calibrated_value(histogram_data[1][-1])
     result_data: numpy.typing.NDArray[numpy.int32] = histogram_data[0].astype(numpy.int32)
@@ -1793,10 +1947,12 @@ def function_line_profile(data_and_metadata_in: _DataAndMetadataLike, vector: No
                           integration_width: float) -> DataAndMetadata.DataAndMetadata:
     data_and_metadata = DataAndMetadata.promote_ndarray(data_and_metadata_in)
 
-    if not Image.is_data_valid(data_and_metadata.data):
+    data = data_and_metadata.data
+
+    if not Image.is_data_valid(data):
         raise ValueError("Line profile: invalid data")
 
-    if not Image.is_data_2d(data_and_metadata.data):
+    if not Image.is_data_2d(data):
         raise ValueError("Line profile: data must be 2D")
 
     assert round(integration_width) > 0  # leave this here for test_evaluation_error_recovers_gracefully
@@ -1810,20 +1966,21 @@ def function_line_profile(data_and_metadata_in: _DataAndMetadataLike, vector: No
         # n=2 => -0.5, 0.5
         # n=3 => -1, 0, 1
         # n=4 => -1.5, -0.5, 0.5, 1.5
-        length_f = math.sqrt(math.pow(end[0] - start[0], 2) + math.pow(end[1] - start[1], 2))
+        length_f = math.hypot(end[0] - start[0], end[1] - start[1])
         samples = int(math.floor(length_f))
         a = numpy.linspace(0, samples - 1, samples)  # along
         t = numpy.linspace(-(n - 1) * 0.5, (n - 1) * 0.5, round(n))  # transverse
         dy = (end[0] - start[0]) / samples
         dx = (end[1] - start[1]) / samples
-        ix, iy = numpy.meshgrid(a, t)  # type: ignore
-        yy = start[0] + dy * ix + dx * iy
-        xx = start[1] + dx * ix - dy * iy
+        # combine the along and transverse terms by broadcasting rows against columns, rather than through a
+        # meshgrid, so that each coordinate array is the only full size allocation.
+        yy = (start[0] + dy * a)[numpy.newaxis, :] + (dx * t)[:, numpy.newaxis]
+        xx = (start[1] + dx * a)[numpy.newaxis, :] - (dy * t)[:, numpy.newaxis]
         return yy, xx
 
     # xx, yy = __coordinates(None, (4,4), (8,4), 3)
 
-    data = data_and_metadata._data_ex
+    assert data is not None
     shape = data.shape
     actual_integration_width = min(max(shape[0], shape[1]), round(integration_width))  # limit integration width to sensible value
 
@@ -1833,17 +1990,27 @@ def function_line_profile(data_and_metadata_in: _DataAndMetadataLike, vector: No
         start, end = vector
         start_data: numpy.typing.NDArray[typing.Any] = numpy.array([int(shape[0] * start[0]), int(shape[1] * start[1])])
         end_data: numpy.typing.NDArray[typing.Any] = numpy.array([int(shape[0] * end[0]), int(shape[1] * end[1])])
-        length = math.sqrt(math.pow(end_data[1] - start_data[1], 2) + math.pow(end_data[0] - start_data[0], 2))
+        length = math.hypot(end_data[1] - start_data[1], end_data[0] - start_data[0])
         if length > 1.0:
             spline_order_lookup = {"nearest": 0, "linear": 1, "quadratic": 2, "cubic": 3}
             method = "nearest"
             spline_order = spline_order_lookup[method]
             yy, xx = get_coordinates(start_data, end_data, actual_integration_width)
-            samples = scipy.ndimage.map_coordinates(data, (yy, xx), order=spline_order)
+            if spline_order == 0:
+                # gather nearest samples directly. this matches map_coordinates with order 0: coordinates round half
+                # up and samples outside the data (constant mode) are zero rather than the nearest edge value.
+                data = numpy.asarray(data)
+                inside = (yy >= 0) & (yy <= data.shape[0] - 1) & (xx >= 0) & (xx <= data.shape[1] - 1)
+                samples = numpy.zeros(yy.shape, data.dtype)
+                iy = numpy.floor(yy[inside] + 0.5).astype(numpy.intp)
+                ix = numpy.floor(xx[inside] + 0.5).astype(numpy.intp)
+                samples[inside] = data[iy, ix]
+            else:
+                samples = scipy.ndimage.map_coordinates(data, (yy, xx), order=spline_order)
             if len(samples.shape) > 1:
                 return typing.cast(_ImageDataType, numpy.sum(samples, 0, dtype=data.dtype))
             else:
-                return typing.cast(_ImageDataType, samples)
+                return samples
         else:
             return numpy.zeros((1,))
 
@@ -2132,10 +2299,10 @@ def auto_threshold(data_and_metadata_in: _DataAndMetadataLike, *, auto_threshold
     """
     data_and_metadata = DataAndMetadata.promote_ndarray(data_and_metadata_in)
 
-    if not Image.is_data_valid(data_and_metadata.data):
-        raise ValueError("Auto threshold: invalid data")
+    data = data_and_metadata.data
 
-    data = data_and_metadata._data_ex
+    if not Image.is_data_valid(data):
+        raise ValueError("Auto threshold: invalid data")
 
     hist, bins = numpy.histogram(data, bins=number_bins) # type: ignore
     if auto_threshold_method == 'average':
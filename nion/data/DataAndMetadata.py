@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 # standard libraries
+import contextlib
 import copy
 import datetime
 import gettext
@@ -107,6 +108,30 @@ def get_size_str(data_shape: typing.Sequence[int], is_spatial: bool = False) ->
     return "(" + spatial_shape_str + ")"
 
 
+_evaluation_context = threading.local()
+_utcnow = datetime.datetime.utcnow
+
+
+@contextlib.contextmanager
+def evaluation_timestamp(timestamp: typing.Optional[datetime.datetime] = None) -> typing.Iterator[datetime.datetime]:
+    """Give data and metadata created on this thread within the context a single shared timestamp.
+
+    Useful when evaluating a graph of functions: the results share the time of the evaluation and the clock is
+    read once rather than for every intermediate result. Defaults to the current time.
+    """
+    old_timestamp = getattr(_evaluation_context, "timestamp", None)
+    _evaluation_context.timestamp = timestamp or _utcnow()
+    try:
+        yield _evaluation_context.timestamp
+    finally:
+        _evaluation_context.timestamp = old_timestamp
+
+
+def _now() -> datetime.datetime:
+    # the timestamp of the evaluation in progress on this thread, if any, otherwise the current time.
+    return getattr(_evaluation_context, "timestamp", None) or _utcnow()
+
+
 class DataMetadata:
     """A class describing data metadata, including size, data type, calibrations, the metadata dict, and the creation timestamp.
 
@@ -156,7 +181,7 @@ class DataMetadata:
             for _ in dimensional_shape:
                 dimensional_calibrations.append(Calibration.Calibration())
         self.dimensional_calibrations = copy.deepcopy(dimensional_calibrations)
-        self.timestamp = timestamp if timestamp else datetime.datetime.utcnow()
+        self.timestamp = timestamp if timestamp else _now()
         self.timezone = timezone
         self.timezone_offset = timezone_offset
         self.metadata = copy.deepcopy(dict(metadata)) if metadata is not None else dict()
@@ -909,21 +934,21 @@ class ScalarAndMetadata:
                  metadata: typing.Optional[MetadataType] = None, timestamp: typing.Optional[datetime.datetime] = None):
         self.value_fn = value_fn
         self.calibration = calibration
-        self.timestamp = timestamp if not timestamp else datetime.datetime.utcnow()
+        self.timestamp = timestamp if timestamp else _now()
         self.metadata = copy.deepcopy(dict(metadata)) if metadata is not None else dict()
 
     @classmethod
     def from_value(cls, value: _ScalarDataType, calibration: typing.Optional[Calibration.Calibration] = None) -> ScalarAndMetadata:
         calibration = calibration or Calibration.Calibration()
         metadata: MetadataType = dict()
-        timestamp = datetime.datetime.utcnow()
+        timestamp = _now()
         return cls(lambda: value, calibration, metadata, timestamp)
 
     @classmethod
     def from_value_fn(cls, value_fn: typing.Callable[[], _ScalarDataType]) -> ScalarAndMetadata:
         calibration = Calibration.Calibration()
         metadata: MetadataType = dict()
-        timestamp = datetime.datetime.utcnow()
+        timestamp = _now()
         return cls(value_fn, calibration, metadata, timestamp)
 
     @property
@@ -955,6 +980,10 @@ def extract_data(evaluated_input: typing.Any) -> typing.Any:
     return evaluated_input
 
 
+# plain int first so the common case avoids the abstract base class instance check.
+_INTEGRAL_TYPES = (int, numbers.Integral)
+
+
 def key_to_list(key: typing.Union[_SliceKeyType, _SliceKeyElementType]) -> typing.List[typing.Dict[str, typing.Any]]:
     if not isinstance(key, tuple):
         key = (key,)
@@ -969,7 +998,7 @@ def key_to_list(key: typing.Union[_SliceKeyType, _SliceKeyElementType]) -> typin
             if k.step is not None:
                 d["step"] = k.step
             l.append(d)
-        elif isinstance(k, numbers.Integral):
+        elif isinstance(k, _INTEGRAL_TYPES):
             l.append({"index": k})
         elif isinstance(k, type(Ellipsis)):
             l.append({"ellipses": True})
@@ -988,7 +1017,7 @@ def list_to_key(l: _SliceDictKeyType) -> _SliceKeyType:
             key.append(d)
         elif d is None:
             key.append(None)
-        elif isinstance(d, numbers.Integral):
+        elif isinstance(d, _INTEGRAL_TYPES):
             key.append(int(d))
         elif "index" in d:
             key.append(int(d.get("index", 0)))
@@ -1041,7 +1070,7 @@ def function_data_slice(data_and_metadata_like: _DataAndMetadataLike, key: _Slic
             for ellipse_index in range(ellipse_count):
                 slices.append((False, False, slice(0, shape[index + ellipse_index], 1)))
             return slices
-        elif isinstance(s, numbers.Integral):
+        elif isinstance(s, _INTEGRAL_TYPES):
             sl = slice(int(s), int(s + 1), 1)
             is_collapsible = True
         elif s is None:
@@ -1104,7 +1133,7 @@ def function_data_slice(data_and_metadata_like: _DataAndMetadataLike, key: _Slic
     if isinstance(slices[0], type(Ellipsis)):
         skip = True
 
-    if not skip and isinstance(slices[0], numbers.Integral):
+    if not skip and isinstance(slices[0], _INTEGRAL_TYPES):
         # print("s")
         is_sequence = False
 
@@ -1116,7 +1145,7 @@ def function_data_slice(data_and_metadata_like: _DataAndMetadataLike, key: _Slic
         if isinstance(slices[collection_dimension_index], type(Ellipsis)):
             # print("ellipsis")
             skip = True
-        elif isinstance(slices[collection_dimension_index], numbers.Integral):
+        elif isinstance(slices[collection_dimension_index], _INTEGRAL_TYPES):
             # print("integral")
             collection_dimension_count -= 1
         elif slices[collection_dimension_index] is None:
@@ -1134,7 +1163,7 @@ def function_data_slice(data_and_metadata_like: _DataAndMetadataLike, key: _Slic
         if isinstance(slices[datum_dimension_index], type(Ellipsis)):
             # print("ellipsis")
             skip = True
-        elif isinstance(slices[datum_dimension_index], numbers.Integral):
+        elif isinstance(slices[datum_dimension_index], _INTEGRAL_TYPES):
             # print("integral")
             datum_dimension_count -= 1
         elif slices[datum_dimension_index] is None:
@@ -200,7 +200,7 @@ def dimensional_shape_from_data(data: _ImageDataType) -> typing.Optional[ShapeTy
 def is_shape_and_dtype_rgb(shape: typing.Optional[ShapeType], dtype: numpy.typing.DTypeLike) -> bool:
     if shape is None or dtype is None:
         return False
-    return dtype == numpy.uint8 and shape[-1] == 3 and len(shape) > 1
+    return len(shape) > 1 and shape[-1] == 3 and dtype == numpy.uint8
 
 
 def is_data_rgb(data: typing.Optional[_ImageDataType]) -> bool:
@@ -210,7 +210,7 @@ def is_data_rgb(data: typing.Optional[_ImageDataType]) -> bool:
 def is_shape_and_dtype_rgba(shape: typing.Optional[ShapeType], dtype: numpy.typing.DTypeLike) -> bool:
     if shape is None or dtype is None:
         return False
-    return dtype == numpy.uint8 and shape[-1] == 4 and len(shape) > 1
+    return len(shape) > 1 and shape[-1] == 4 and dtype == numpy.uint8
 
 
 def is_data_rgba(data: typing.Optional[_ImageDataType]) -> bool:
@@ -218,7 +218,10 @@ def is_data_rgba(data: typing.Optional[_ImageDataType]) -> bool:
 
 
 def is_shape_and_dtype_rgb_type(shape: typing.Optional[ShapeType], dtype: numpy.typing.DTypeLike) -> bool:
-    return is_shape_and_dtype_rgb(shape, dtype) or is_shape_and_dtype_rgba(shape, dtype)
+    # check the shape before the (slower) dtype comparison, and compare the dtype only once.
+    if shape is None or dtype is None:
+        return False
+    return len(shape) > 1 and shape[-1] in (3, 4) and dtype == numpy.uint8
 
 
 def is_data_rgb_type(data: typing.Optional[_ImageDataType]) -> bool:
@@ -20,6 +20,22 @@ from nion.data import DataAndMetadata
 from nion.data.DataAndMetadata import _ImageDataType
 
 
+class LoadCounter:
+    """Make unloadable data and metadata of ones, counting how many times their data gets loaded."""
+
+    def __init__(self) -> None:
+        self.load_count = 0
+
+    def make_xdata(self, shape: DataAndMetadata.ShapeType) -> DataAndMetadata.DataAndMetadata:
+        def data_fn() -> _ImageDataType:
+            self.load_count += 1
+            return numpy.ones(shape)
+
+        xdata = DataAndMetadata.DataAndMetadata(data_fn, (shape, numpy.dtype(numpy.float64)))
+        xdata.unloadable = True
+        return xdata
+
+
 class TestCore(unittest.TestCase):
 
     def setUp(self) -> None:
@@ -66,6 +82,35 @@ class TestCore(unittest.TestCase):
             vector = (0.1, 0.2), (0.3, 0.4)
             Core.function_line_profile(DataAndMetadata.new_data_and_metadata(numpy.zeros((32, 32), numpy.complex128)), vector, 3.0)
 
+    def test_line_profile_treats_samples_outside_data_as_zero(self) -> None:
+        # a width 5 profile along column 1 reaches column -1, which is outside the data and must not repeat the edge.
+        data = numpy.ones((32, 32), numpy.int32)
+        xdata = DataAndMetadata.new_data_and_metadata(data)
+        line_profile_data = Core.function_line_profile(xdata, ((8 / 32, 1 / 32), (24 / 32, 1 / 32)), 5.0)._data_ex
+        self.assertTrue(numpy.array_equal(line_profile_data, numpy.full((16,), 4, numpy.int32)))
+
+    def test_dtype_to_str_accepts_dtype_instances_and_types(self) -> None:
+        for dtype_str in ("int16", "int32", "int64", "uint8", "uint16", "uint32", "uint64", "float32", "float64", "complex64", "complex128"):
+            dtype = Core.str_to_dtype(dtype_str)
+            self.assertEqual(dtype_str, Core.dtype_to_str(dtype))
+            self.assertEqual(dtype_str, Core.dtype_to_str(numpy.dtype(dtype)))
+            self.assertEqual(dtype_str, Core.dtype_to_str(numpy.dtype(dtype).type))
+        self.assertEqual(numpy.dtype(numpy.float64), numpy.dtype(Core.str_to_dtype("float")))
+        self.assertEqual(numpy.dtype(numpy.float64), numpy.dtype(Core.str_to_dtype("unknown")))
+        # scalar types and builtin types keep their names and map entries.
+        self.assertEqual("float32", Core.dtype_map[numpy.float32])
+        self.assertIs(numpy.float32, Core.str_to_dtype("float32"))
+        self.assertEqual("float", Core.dtype_to_str(float))
+        self.assertEqual("int", Core.dtype_to_str(int))
+        self.assertEqual("complex", Core.dtype_to_str(complex))
+        self.assertEqual("float", Core.dtype_to_str(None))
+
+    def test_arange_matches_numpy_arange(self) -> None:
+        self.assertTrue(numpy.array_equal(numpy.arange(5), Core.arange(5)._data_ex))
+        self.assertTrue(numpy.array_equal(numpy.arange(2, 9), Core.arange(2, 9)._data_ex))
+        self.assertTrue(numpy.array_equal(numpy.arange(2, 9, 3), Core.arange(2, 9, 3)._data_ex))
+        self.assertTrue(numpy.array_equal(numpy.arange(9, 2, -2), Core.arange(9, 2, -2)._data_ex))
+
     def test_fft_produces_correct_calibration(self) -> None:
         src_data = ((numpy.abs(numpy.random.randn(16, 16)) + 1) * 10).astype(numpy.float32)
         dimensional_calibrations = (Calibration.Calibration(offset=3), Calibration.Calibration(offset=2))
@@ -109,6 +154,13 @@ class TestCore(unittest.TestCase):
         src_data_2 = fft._data_ex
         self.assertLess(numpy.sqrt(numpy.mean(numpy.square(numpy.absolute(src_data)))) - numpy.sqrt(numpy.mean(numpy.square(numpy.absolute(src_data_2)))), 1E-12)
 
+    def test_fft_2d_of_single_precision_data_is_double_precision(self) -> None:
+        for dtype in (numpy.float32, numpy.complex64):
+            d = numpy.random.randn(16, 16).astype(dtype)
+            fft = Core.function_fft(DataAndMetadata.new_data_and_metadata(d))
+            self.assertEqual(numpy.complex128, fft.data_dtype)
+            self.assertTrue(numpy.allclose(numpy.fft.fftshift(numpy.fft.fft2(d)) / 16, fft._data_ex, atol=1E-12))
+
     def test_concatenate_works_with_1d_inputs(self) -> None:
         src_data1 = ((numpy.abs(numpy.random.randn(16)) + 1) * 10).astype(numpy.float32)
         src_data2 = ((numpy.abs(numpy.random.randn(16)) + 1) * 10).astype(numpy.float32)
@@ -119,6 +171,72 @@ class TestCore(unittest.TestCase):
         self.assertEqual(tuple(c0._data_ex.shape), tuple(c0.data_shape))
         self.assertTrue(numpy.array_equal(c0._data_ex, numpy.concatenate([src_data1, src_data2], 0)))  # type: ignore
 
+    def test_concatenate_and_stack_load_unloadable_data_once(self) -> None:
+        for fn, shape in ((Core.function_concatenate, (4, 3)), (Core.function_hstack, (4, 3)), (Core.function_vstack, (4, 3)), (Core.function_vstack, (3,))):
+            load_counter = LoadCounter()
+            fn([load_counter.make_xdata(shape), load_counter.make_xdata(shape)])
+            self.assertEqual(2, load_counter.load_count)
+
+    def test_functions_load_unloadable_data_once(self) -> None:
+        # each function is paired with the number of times it loads the data; crosscorrelate passes it twice.
+        cases: typing.List[typing.Tuple[typing.Callable[[DataAndMetadata.DataAndMetadata], typing.Any], int]] = [
+            (Core.function_fft, 1),
+            (Core.function_autocorrelate, 1),
+            (Core.function_sobel, 1),
+            (Core.function_invert, 1),
+            (Core.function_transpose_flip, 1),
+            (Core.function_squeeze, 1),
+            (Core.function_rescale, 1),
+            (lambda xdata: Core.function_gaussian_blur(xdata, 1.0), 1),
+            (lambda xdata: Core.function_sum(xdata, 0), 1),
+            (lambda xdata: Core.function_reshape(xdata, (48,)), 1),
+            (lambda xdata: Core.function_resample_2d(xdata, (4, 3)), 1),
+            (lambda xdata: Core.function_histogram(xdata, 4), 1),
+            (lambda xdata: Core.function_line_profile(xdata, ((0.1, 0.1), (0.9, 0.9)), 1.0), 1),
+            (lambda xdata: Core.function_crosscorrelate(xdata, xdata), 2),
+        ]
+        for fn, expected_load_count in cases:
+            load_counter = LoadCounter()
+            fn(load_counter.make_xdata((8, 6)))
+            self.assertEqual(expected_load_count, load_counter.load_count)
+
+    def test_concatenate_and_stack_of_large_data_match_numpy(self) -> None:
+        # lower the size threshold so that small data takes the threaded copy used for large results.
+        threaded_bytes = Core._concatenate_threaded_bytes
+        Core._concatenate_threaded_bytes = 0
+        try:
+            data1 = numpy.random.randn(6, 5)
+            data2 = numpy.random.randn(4, 5).astype(numpy.float32)
+            data3 = numpy.random.randn(6, 3).astype(numpy.float32)
+            cases: typing.List[typing.Tuple[typing.List[_ImageDataType], int]] = [([data1, data2], 0), ([data1, data3], 1), ([data1, data3, data1], -1), ([data2, data1, data2], -2)]
+            for data_list, axis in cases:
+                xdata = Core.function_concatenate([DataAndMetadata.new_data_and_metadata(data) for data in data_list], axis)
+                expected: _ImageDataType = numpy.concatenate(data_list, axis)
+                self.assertEqual(expected.dtype, xdata.data_dtype)
+                self.assertTrue(numpy.array_equal(expected, xdata._data_ex))
+            xdata = Core.function_hstack([DataAndMetadata.new_data_and_metadata(data) for data in (data1, data3)])
+            self.assertTrue(numpy.array_equal(numpy.hstack([data1, data3]), xdata._data_ex))
+            xdata = Core.function_vstack([DataAndMetadata.new_data_and_metadata(data) for data in (data1, data2)])
+            self.assertTrue(numpy.array_equal(numpy.vstack([data1, data2]), xdata._data_ex))
+            rows: typing.List[_ImageDataType] = [numpy.random.randn(5), numpy.random.randn(5).astype(numpy.float32), numpy.random.randn(5)]
+            xdata = Core.function_vstack([DataAndMetadata.new_data_and_metadata(row) for row in rows])
+            expected = numpy.vstack(rows)
+            self.assertEqual(expected.dtype, xdata.data_dtype)
+            self.assertTrue(numpy.array_equal(expected, xdata._data_ex))
+            self.assertEqual(DataAndMetadata.DataDescriptor(False, 1, 1), xdata.data_descriptor)
+        finally:
+            Core._concatenate_threaded_bytes = threaded_bytes
+
+    def test_concatenate_requires_same_shape_except_along_axis(self) -> None:
+        xdata1 = DataAndMetadata.new_data_and_metadata(numpy.random.randn(3, 4))
+        xdata2 = DataAndMetadata.new_data_and_metadata(numpy.random.randn(3, 5))
+        self.assertEqual((3, 9), Core.function_concatenate([xdata1, xdata2], 1).data_shape)
+        self.assertEqual((3, 9), Core.function_concatenate([xdata1, xdata2], -1).data_shape)
+        with self.assertRaises(ValueError):
+            Core.function_concatenate([xdata1, xdata2], 0)
+        with self.assertRaises(ValueError):
+            Core.function_concatenate([xdata1, DataAndMetadata.new_data_and_metadata(numpy.random.randn(3))], 0)
+
     def test_concatenate_propagates_data_descriptor(self) -> None:
         data1 = numpy.ones((16, 32))
         data2 = numpy.ones((8, 32))
@@ -175,6 +293,14 @@ class TestCore(unittest.TestCase):
         self.assertEqual(tuple(hstack._data_ex.shape), tuple(hstack.data_shape))
         self.assertTrue(numpy.array_equal(hstack._data_ex, numpy.hstack([src_data1, src_data2])))
 
+    def test_vstack_of_1d_input_followed_by_2d_inputs_matches_numpy(self) -> None:
+        src_data_list: typing.List[_ImageDataType] = [numpy.random.randn(16), numpy.random.randn(2, 16), numpy.random.randn(3, 16)]
+        vstack = Core.function_vstack([DataAndMetadata.new_data_and_metadata(src_data) for src_data in src_data_list])
+        self.assertEqual((6, 16), vstack.data_shape)
+        self.assertTrue(numpy.array_equal(vstack._data_ex, numpy.vstack(src_data_list)))
+        with self.assertRaises(ValueError):
+            Core.function_vstack([DataAndMetadata.new_data_and_metadata(numpy.ones(16)), DataAndMetadata.new_data_and_metadata(numpy.ones(8))])
+
     def test_sum_over_two_axes_returns_correct_shape(self) -> None:
         src = DataAndMetadata.DataAndMetadata.from_data(numpy.ones((4, 4, 16)))
         dst = Core.function_sum(src, (0, 1))
@@ -233,6 +359,23 @@ class TestCore(unittest.TestCase):
         self.assertTrue(numpy.array_equal(dst1._data_ex[1], (1, 1, 1, 1)))
         self.assertTrue(numpy.array_equal(dst1._data_ex[2], (0, 0, 0, 0)))
 
+    def test_sum_of_float32_accumulates_in_double_precision(self) -> None:
+        data = numpy.random.rand(4096, 8).astype(numpy.float32)
+        src = DataAndMetadata.DataAndMetadata.from_data(data)
+        dst = Core.function_sum(src, 0)
+        self.assertEqual(numpy.float32, dst._data_ex.dtype)
+        self.assertTrue(numpy.array_equal(numpy.sum(data.astype(numpy.float64), 0).astype(numpy.float32), dst._data_ex))
+
+    def test_sum_and_mean_over_non_square_rgb_average_each_channel(self) -> None:
+        data = numpy.random.randint(0, 256, (6, 4, 3)).astype(numpy.uint8)
+        src = DataAndMetadata.DataAndMetadata.from_data(data)
+        for fn in (Core.function_sum, Core.function_mean):
+            for axis in (0, 1, -1):
+                dst = fn(src, axis)
+                expected = numpy.stack([numpy.average(data[..., channel], axis) for channel in range(3)], -1).astype(numpy.uint8)
+                self.assertEqual(dst.data_shape, dst._data_ex.shape)
+                self.assertTrue(numpy.array_equal(expected, dst._data_ex))
+
     def test_fourier_filter_gives_sensible_units_when_source_has_units(self) -> None:
         dimensional_calibrations = [Calibration.Calibration(units="mm"), Calibration.Calibration(units="mm")]
         src = DataAndMetadata.DataAndMetadata.from_data(numpy.ones((32, 32)), dimensional_calibrations=dimensional_calibrations)
@@ -255,6 +398,32 @@ class TestCore(unittest.TestCase):
             masked_data = Core.function_ifft(Core.function_fourier_mask(fft, mask))._data_ex
             self.assertAlmostEqual(numpy.sum(numpy.imag(masked_data)), 0)  # type: ignore
 
+    def test_fourier_mask_mirrors_mask_through_center(self) -> None:
+        for h, w in [(8, 8), (7, 6), (6, 7), (7, 7), (1, 6), (6, 1)]:
+            data = numpy.random.randn(h, w)
+            mask = numpy.random.rand(h, w)
+            y_half, x_half = h // 2, w // 2
+            expected = numpy.empty_like(data)
+            for y in range(h):
+                for x in range(w):
+                    if 0 < y < y_half and x != 0 and x != x_half:
+                        expected[y, x] = data[y, x] * mask[2 * y_half - y, 2 * x_half - x]
+                    else:
+                        expected[y, x] = data[y, x] * mask[y, x]
+            masked_data = Core.function_fourier_mask(DataAndMetadata.new_data_and_metadata(data), DataAndMetadata.new_data_and_metadata(mask))._data_ex
+            self.assertTrue(numpy.array_equal(expected, masked_data))
+
+    def test_gaussian_blur_of_large_image_matches_gaussian_filter(self) -> None:
+        data = numpy.random.randn(1200, 500)
+        rgba_data = numpy.random.randint(0, 256, (1100, 400, 4), dtype=numpy.uint8)
+        for sigma in (0.05, 1.5, 6.0):
+            blurred = Core.function_gaussian_blur(DataAndMetadata.new_data_and_metadata(data), sigma)._data_ex
+            self.assertTrue(numpy.array_equal(scipy.ndimage.gaussian_filter(data, sigma), blurred))
+            blurred_rgba = Core.function_gaussian_blur(DataAndMetadata.new_data_and_metadata(rgba_data), sigma)._data_ex
+            for channel in range(3):
+                self.assertTrue(numpy.array_equal(scipy.ndimage.gaussian_filter(rgba_data[..., channel], sigma), blurred_rgba[..., channel]))
+            self.assertTrue(numpy.array_equal(rgba_data[..., 3], blurred_rgba[..., 3]))
+
     def test_slice_sum_grabs_signal_index(self) -> None:
         random_data = numpy.random.randn(3, 4, 5)
         c0 = Calibration.Calibration(units="a")
@@ -412,11 +581,36 @@ class TestCore(unittest.TestCase):
         self.assertEqual(result.intensity_calibration, data_and_metadata.intensity_calibration)
         self.assertEqual(result.dimensional_calibrations[0], data_and_metadata.dimensional_calibrations[0])
 
+    def test_slice_sum_of_float32_accumulates_in_double_precision(self) -> None:
+        data = numpy.random.rand(8, 4096).astype(numpy.float32)
+        src = DataAndMetadata.DataAndMetadata.from_data(data)
+        dst = Core.function_slice_sum(src, 2048, 4000)
+        self.assertEqual(numpy.float32, dst._data_ex.dtype)
+        self.assertTrue(numpy.array_equal(numpy.sum(data[..., 48:4048].astype(numpy.float64), -1).astype(numpy.float32), dst._data_ex))
+
     def test_fft_works_on_rgba_data(self) -> None:
         random_data = numpy.random.randint(0, 256, (32, 32, 4), numpy.uint8)
         data_and_metadata = DataAndMetadata.new_data_and_metadata(random_data)
         Core.function_fft(data_and_metadata)
 
+    def test_filters_on_rgb_type_data_filter_each_channel(self) -> None:
+        filters: typing.List[typing.Tuple[typing.Callable[..., DataAndMetadata.DataAndMetadata], typing.Callable[..., typing.Any]]] = [
+            (Core.function_sobel, lambda d: numpy.clip(scipy.ndimage.sobel(d.astype(numpy.float32)), 0, 255).astype(numpy.uint8)),
+            (Core.function_laplace, lambda d: numpy.clip(scipy.ndimage.laplace(d.astype(numpy.float32)), 0, 255).astype(numpy.uint8)),
+            (lambda d: Core.function_median_filter(d, 3), lambda d: scipy.ndimage.median_filter(d, size=3)),
+            (lambda d: Core.function_uniform_filter(d, 3), lambda d: scipy.ndimage.uniform_filter(d, size=3)),
+        ]
+        for channel_count in (3, 4):
+            data = numpy.random.randint(0, 256, (12, 14, channel_count)).astype(numpy.uint8)
+            xdata = DataAndMetadata.new_data_and_metadata(data)
+            for core_fn, channel_fn in filters:
+                filtered = core_fn(xdata)._data_ex
+                self.assertEqual(numpy.uint8, filtered.dtype)
+                for channel in range(3):
+                    self.assertTrue(numpy.array_equal(channel_fn(data[..., channel]), filtered[..., channel]))
+                if channel_count == 4:
+                    self.assertTrue(numpy.array_equal(data[..., 3], filtered[..., 3]))
+
     def test_display_data_2d_not_a_view(self) -> None:
         random_data = numpy.random.randint(0, 256, (2, 2), numpy.uint8)
         data_and_metadata = DataAndMetadata.new_data_and_metadata(random_data)
@@ -870,6 +1064,48 @@ class TestCore(unittest.TestCase):
         self.assertIsNot(dimensional_calibrations, result.dimensional_calibrations)  # verify
         self.assertEqual(tuple(dimensional_calibrations), tuple(result.dimensional_calibrations))
 
+    def test_auto_correlation_batch_matches_individual_auto_correlation(self) -> None:
+        data_list = [numpy.random.randn(16, 18) for _ in range(3)] + [numpy.ones((16, 18))]
+        xdata_list = [DataAndMetadata.new_data_and_metadata(data) for data in data_list]
+        results = Core.function_autocorrelate_batch(xdata_list)
+        self.assertEqual(len(xdata_list), len(results))
+        for xdata, result in zip(xdata_list, results):
+            self.assertTrue(numpy.allclose(Core.function_autocorrelate(xdata)._data_ex, result._data_ex))
+
+    def test_auto_correlation_batch_requires_same_shape(self) -> None:
+        xdata_list = [DataAndMetadata.new_data_and_metadata(numpy.random.randn(16, 16)), DataAndMetadata.new_data_and_metadata(numpy.random.randn(16, 18))]
+        with self.assertRaises(ValueError):
+            Core.function_autocorrelate_batch(xdata_list)
+
+    def test_auto_correlation_of_odd_shape_keeps_shape(self) -> None:
+        xdata = DataAndMetadata.new_data_and_metadata(numpy.random.randn(15, 17))
+        self.assertEqual((15, 17), Core.function_autocorrelate(xdata).data_shape)
+
+    def test_cross_correlation_of_odd_shape_keeps_shape(self) -> None:
+        xdata1 = DataAndMetadata.new_data_and_metadata(numpy.random.randn(15, 17))
+        xdata2 = DataAndMetadata.new_data_and_metadata(numpy.random.randn(15, 17))
+        self.assertEqual((15, 17), Core.function_crosscorrelate(xdata1, xdata2).data_shape)
+
+    def test_correlation_of_complex_data_uses_real_part(self) -> None:
+        def normalized(d: _ImageDataType) -> _ImageDataType:
+            # the real part, scaled by the deviation of the complex values from its mean
+            d_norm = d.real - d.real.mean()
+            return typing.cast(_ImageDataType, d_norm / numpy.sqrt(numpy.mean(numpy.square(d_norm) + numpy.square(d.imag))))
+        data1 = numpy.random.randn(16, 12) + 1j * numpy.random.randn(16, 12)
+        data2 = numpy.random.randn(16, 12) + 1j * numpy.random.randn(16, 12)
+        norm1 = normalized(data1)
+        norm2 = normalized(data2)
+        expected = numpy.fft.fftshift(numpy.fft.irfft2(numpy.fft.rfft2(norm1) * numpy.conj(numpy.fft.rfft2(norm2)), s=norm1.shape)) / norm1.size
+        result = Core.function_crosscorrelate(DataAndMetadata.new_data_and_metadata(data1), DataAndMetadata.new_data_and_metadata(data2))
+        self.assertEqual(numpy.float64, result.data_dtype)
+        self.assertTrue(numpy.allclose(expected, result._data_ex))
+        expected = numpy.fft.fftshift(numpy.fft.irfft2(numpy.abs(numpy.fft.rfft2(norm1)) ** 2, s=norm1.shape)) / norm1.size
+        result = Core.function_autocorrelate(DataAndMetadata.new_data_and_metadata(data1))
+        self.assertEqual(numpy.float64, result.data_dtype)
+        self.assertTrue(numpy.allclose(expected, result._data_ex))
+        results = Core.function_autocorrelate_batch([DataAndMetadata.new_data_and_metadata(data1)])
+        self.assertTrue(numpy.allclose(expected, results[0]._data_ex))
+
     def test_cross_correlation_keeps_calibration(self) -> None:
         # configure dimensions so that the pixels go from -16S to 16S
         dimensional_calibrations = (Calibration.Calibration(-16, 2, "S"), Calibration.Calibration(-16, 2, "S"))
@@ -894,6 +1130,12 @@ class TestCore(unittest.TestCase):
         self.assertEqual(5, x_calibration.convert_to_calibrated_value(0))
         self.assertEqual(26, x_calibration.convert_to_calibrated_value(16))
 
+    def test_histogram_of_integer_data_matches_numpy_histogram(self) -> None:
+        for data in (numpy.random.randint(0, 4000, (64, 64)).astype(numpy.uint16), numpy.random.randint(-100, 100, (32, 32)).astype(numpy.int8), numpy.full((4, 4), 7, numpy.int32), numpy.random.rand(16, 16)):
+            for bins in (1, 7, 256):
+                result = Core.function_histogram(DataAndMetadata.new_data_and_metadata(data), bins)
+                self.assertTrue(numpy.array_equal(numpy.histogram(data, bins=bins)[0], result._data_ex))
+
     def test_crop_out_of_bounds_produces_proper_size_data(self) -> None:
         data: numpy.typing.NDArray[numpy.uint32] = numpy.ones((16, 16), numpy.uint32)
         xdata = DataAndMetadata.new_data_and_metadata(data)
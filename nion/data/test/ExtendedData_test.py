@@ -1,4 +1,5 @@
 # standard libraries
+import datetime
 import h5py
 import logging
 import os
@@ -134,6 +135,22 @@ class TestExtendedData(unittest.TestCase):
         xdata.data_descriptor.is_sequence = True
         self.assertFalse(xdata.data_descriptor.is_sequence)
 
+    def test_evaluation_timestamp_is_shared_by_new_data_and_scalars(self) -> None:
+        timestamp = datetime.datetime(2020, 1, 2, 3, 4, 5)
+        with DataAndMetadata.evaluation_timestamp(timestamp):
+            xdata1 = DataAndMetadata.new_data_and_metadata(numpy.ones((4, 4)))
+            xdata2 = xdata1 + 1
+            scalar = DataAndMetadata.ScalarAndMetadata.from_value(1)
+        self.assertEqual(timestamp, xdata1.timestamp)
+        self.assertEqual(timestamp, xdata2.timestamp)
+        self.assertEqual(timestamp, scalar.timestamp)
+        self.assertNotEqual(timestamp, DataAndMetadata.new_data_and_metadata(numpy.ones((4, 4))).timestamp)
+
+    def test_scalar_keeps_explicit_timestamp(self) -> None:
+        timestamp = datetime.datetime(2020, 1, 2, 3, 4, 5)
+        self.assertEqual(timestamp, DataAndMetadata.ScalarAndMetadata(lambda: 1, Calibration.Calibration(), timestamp=timestamp).timestamp)
+        self.assertIsNotNone(DataAndMetadata.ScalarAndMetadata(lambda: 1, Calibration.Calibration()).timestamp)
+
 
 if __name__ == '__main__':
     logging.getLogger().setLevel(logging.DEBUG)
@@ -221,6 +221,9 @@ def ifft(data_and_metadata: _DataAndMetadataLike) -> DataAndMetadata.DataAndMeta
 def autocorrelate(data_and_metadata: _DataAndMetadataLike) -> DataAndMetadata.DataAndMetadata:
     return Core.function_autocorrelate(data_and_metadata)
 
+def autocorrelate_batch(data_and_metadata_list: typing.Sequence[_DataAndMetadataLike]) -> typing.Sequence[DataAndMetadata.DataAndMetadata]:
+    return Core.function_autocorrelate_batch(data_and_metadata_list)
+
 def crosscorrelate(data_and_metadata1: _DataAndMetadataIndeterminateSizeLike, data_and_metadata2: _DataAndMetadataIndeterminateSizeLike) -> DataAndMetadata.DataAndMetadata:
     return Core.function_crosscorrelate(data_and_metadata1, data_and_metadata2)
 